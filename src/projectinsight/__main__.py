@@ -4,29 +4,73 @@ ProjectInsight 主執行入口。
 """
 
 # 1. 標準庫導入
+import concurrent.futures
 import logging
+import multiprocessing
+import sys
+from pathlib import Path
 
 # 2. 第三方庫導入
 import yaml
 
 # 3. 本專案導入
-from projectinsight.core.project_processor import ProjectProcessor
-from projectinsight.utils.logging_utils import PickleFilter
+from projectinsight.core.parallel_manager import available_cpu_count
+from projectinsight.core.project_processor import ProjectProcessor, init_project_worker, run_project
+from projectinsight.utils.logging_utils import configure_logging
 from projectinsight.utils.path_utils import find_project_root
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+def _may_start_wizard(config_path: Path) -> bool:
+    """
+    判斷專案在目前的環境下是否可能啟動互動式精靈，條件與 ProjectProcessor._needs_wizard 一致。
+    子程序的標準輸入是 /dev/null，可能需要精靈的專案必須留在主程序中執行。
+    """
+    if not sys.stdout.isatty():
+        return False
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            config = yaml.load(f, Loader=_SafeLoader)
+    except (OSError, yaml.YAMLError):
+        # 設定檔無法載入時，ProjectProcessor 也會直接終止處理，不會啟動精靈。
+        return False
+    if not isinstance(config, dict):
+        return False
+    return not ProjectProcessor.wizard_suppressed_by_config(config)
+
+
+def _run_projects_in_parallel(projects_dir: Path, active_projects: list[str], max_workers: int):
+    """
+    以多程序平行處理多個專案。
+    子程序無法與使用者互動，因此只在所有專案都不會啟動精靈時使用。
+    每個專案子程序內部的平行任務分得 CPU 數量的一部分，讓總程序數不超過可用的 CPU 數量。
+    """
+    cpu_count = available_cpu_count()
+    worker_budget = max(1, cpu_count // max_workers)
+    logging.info(
+        f"以 {max_workers} 個程序平行處理 {len(active_projects)} 個專案，每個專案最多使用 {worker_budget} 個工作程序。"
+    )
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_project_worker,
+        initargs=(worker_budget,),
+    ) as executor:
+        futures = {executor.submit(run_project, projects_dir / name): name for name in active_projects}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"處理專案 '{futures[future]}' 時發生未預期的嚴重錯誤: {e}", exc_info=True)
+
 
 def main():
     """主函式，讀取工作區設定，並為每個指定的專案執行處理流程。"""
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-
-    if not root_logger.handlers:
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        console_handler.setFormatter(formatter)
-        console_handler.addFilter(PickleFilter())
-        root_logger.addHandler(console_handler)
+    configure_logging()
 
     try:
         project_root = find_project_root()
@@ -45,7 +89,7 @@ def main():
 
     try:
         with open(workspace_path, encoding="utf-8") as f:
-            workspace_config = yaml.safe_load(f)
+            workspace_config = yaml.load(f, Loader=_SafeLoader)
     except yaml.YAMLError as e:
         logging.error(f"解析工作區設定檔時發生錯誤: {e}")
         return
@@ -56,6 +100,12 @@ def main():
         return
 
     logging.info(f"ProjectInsight 工具啟動，在工作區中找到 {len(active_projects)} 個活躍專案。")
+    # 只有一個可用 CPU 時，子程序只會依序處理專案，徒增啟動成本，因此留在主程序中執行。
+    max_workers = min(len(active_projects), available_cpu_count())
+    if max_workers > 1 and not any(_may_start_wizard(projects_dir / name) for name in active_projects):
+        _run_projects_in_parallel(projects_dir, active_projects, max_workers)
+        return
+
     for project_config_name in active_projects:
         config_path = projects_dir / project_config_name
         try:
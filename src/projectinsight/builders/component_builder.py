@@ -5,85 +5,164 @@
 """
 
 # 1. 標準庫導入
-import fnmatch
+import itertools
 import logging
-from collections import defaultdict, deque
+from collections import defaultdict
+from functools import cached_property
 from typing import Any
 
 # 2. 第三方庫導入
 # (無)
-
 # 3. 本專案導入
-# (無)
+from projectinsight.utils.pattern_utils import compile_fnmatch_patterns
 
 
-def _perform_focus_analysis(
-    all_nodes: set[str],
-    all_edges: set[tuple[str, str]],
-    focus_config: dict[str, Any],
-    current_depth: int,
-) -> tuple[set[str], set[tuple[str, str]]]:
+class _LazyAdjacency:
     """
-    根據聚焦設定，在有向圖上執行 BFS 以縮小圖的規模。
-    支援方向控制：'both', 'upstream' (predecessors), 'downstream' (successors)。
+    依需求建立的後繼與前驅鄰接表，供同一次建構中的多輪聚焦分析共用。
+    單向搜尋只會用到其中一個方向，另一個方向的鄰接表便不會被建立。
     """
-    entrypoints = focus_config.get("entrypoints", [])
-    direction = focus_config.get("direction", "both")
 
-    if not entrypoints:
-        return all_nodes, all_edges
+    def __init__(self, edges: set[tuple[str, str]]):
+        self.edges = edges
+
+    @cached_property
+    def successors(self) -> dict[str, list[str]]:
+        """每個節點的後繼節點 (下游)。"""
+        successors: dict[str, list[str]] = defaultdict(list)
+        for u, v in self.edges:
+            successors[u].append(v)
+        return successors
+
+    @cached_property
+    def predecessors(self) -> dict[str, list[str]]:
+        """每個節點的前驅節點 (上游)。"""
+        predecessors: dict[str, list[str]] = defaultdict(list)
+        for u, v in self.edges:
+            predecessors[v].append(u)
+        return predecessors
+
+    def edges_within(self, nodes: set[str]) -> set[tuple[str, str]]:
+        """
+        回傳兩端點皆在 nodes 中的邊，只走訪這些節點的鄰接串列而非掃描整張圖。
+        優先使用已建立的方向，避免只為了收集邊而建立另一個方向的鄰接表。
+        """
+        if "successors" not in self.__dict__ and "predecessors" in self.__dict__:
+            predecessors = self.predecessors
+            return {(u, v) for v in nodes if v in predecessors for u in predecessors[v] if u in nodes}
+        successors = self.successors
+        return {(u, v) for u in nodes if u in successors for v in successors[u] if v in nodes}
+
+
+class _IncrementalBFS:
+    """
+    一個可逐步加深的 BFS 狀態。
+    以逐層的前沿 (frontier) 串列展開，不需佇列與每個節點的深度標記；
+    加深時沿用上一輪的已訪問集合與前沿，只向外展開新增的層數，前沿為空時即提早結束。
+    """
 
-    logging.debug(f"--- FOCUS ANALYSIS (depth={current_depth}, direction={direction}) ---")
-    logging.debug(f"Entrypoints: {entrypoints}")
+    def __init__(self, adjacency: dict[str, list[str]], seeds: set[str]):
+        self.adjacency = adjacency
+        self.visited: set[str] = set(seeds)
+        self.frontier: list[str] = list(self.visited)
+        self.depth = 0
+
+    def expand_to(self, max_depth: int) -> set[str]:
+        """將搜尋擴展至指定深度，並回傳目前所有已訪問的節點。"""
+        adjacency = self.adjacency
+        visited = self.visited
+        frontier = self.frontier
+        while self.depth < max_depth and frontier:
+            next_frontier = []
+            for node in frontier:
+                for neighbor in adjacency.get(node, ()):
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+            self.depth += 1
+
+        self.frontier = frontier
+        return visited
+
+    @property
+    def exhausted(self) -> bool:
+        """前沿為空時，代表所有可達節點皆已訪問，再加深也不會有新節點。"""
+        return not self.frontier
 
-    successors: dict[str, list[str]] = defaultdict(list)
-    predecessors: dict[str, list[str]] = defaultdict(list)
-    for u, v in all_edges:
-        successors[u].append(v)
-        predecessors[v].append(u)
 
-    final_nodes = set()
-    for ep in entrypoints:
-        if ep in all_nodes:
-            final_nodes.add(ep)
+def _perform_focus_analysis(
+    entrypoints: set[str],
+    direction: str,
+    current_depth: int,
+    adjacency: _LazyAdjacency,
+    bfs_states: dict[str, _IncrementalBFS],
+) -> set[str]:
+    """
+    根據聚焦設定，在有向圖上執行 BFS 以縮小圖的規模，並回傳聚焦後的節點集合。
+    支援方向控制：'both', 'upstream' (predecessors), 'downstream' (successors)。
+    鄰接表由呼叫端提供並依需求建立；bfs_states 保存各方向的搜尋狀態，讓深度遞增時可以接續上一輪的結果。
+    聚焦後的邊由呼叫端在決定最終節點後一次性收集。
+    entrypoints 須為已確認存在於圖中的入口點集合，由呼叫端在深度迴圈外驗證一次。
+    """
+    debug_enabled = logging.getLogger().isEnabledFor(logging.DEBUG)
+    if debug_enabled:
+        logging.debug(f"--- FOCUS ANALYSIS (depth={current_depth}, direction={direction}) ---")
+        logging.debug(f"Entrypoints: {entrypoints}")
+
+    final_nodes = set(entrypoints)
 
     if direction in ("both", "downstream"):
-        visited_successors = set(final_nodes)
-        queue_succ = deque([(ep, 0) for ep in final_nodes])
-
-        while queue_succ:
-            node, depth = queue_succ.popleft()
-            if depth >= current_depth:
-                continue
-            for neighbor in successors.get(node, []):
-                if neighbor not in visited_successors:
-                    visited_successors.add(neighbor)
-                    queue_succ.append((neighbor, depth + 1))
+        if "downstream" not in bfs_states:
+            bfs_states["downstream"] = _IncrementalBFS(adjacency.successors, final_nodes)
+        visited_successors = bfs_states["downstream"].expand_to(current_depth)
 
         final_nodes.update(visited_successors)
-        logging.debug(f"Collected {len(visited_successors)} nodes from downstream analysis.")
+        if debug_enabled:
+            logging.debug(f"Collected {len(visited_successors)} nodes from downstream analysis.")
 
     if direction in ("both", "upstream"):
-        visited_predecessors = set(final_nodes)
-        queue_pred = deque([(ep, 0) for ep in final_nodes])
-
-        while queue_pred:
-            node, depth = queue_pred.popleft()
-            if depth >= current_depth:
-                continue
-            for neighbor in predecessors.get(node, []):
-                if neighbor not in visited_predecessors:
-                    visited_predecessors.add(neighbor)
-                    queue_pred.append((neighbor, depth + 1))
+        if direction == "upstream":
+            if "upstream" not in bfs_states:
+                bfs_states["upstream"] = _IncrementalBFS(adjacency.predecessors, final_nodes)
+            upstream_search = bfs_states["upstream"]
+        else:
+            # 雙向模式的上游搜尋以下游結果為起點，起點集合隨深度改變，因此每輪重新搜尋。
+            upstream_search = _IncrementalBFS(adjacency.predecessors, final_nodes)
+            bfs_states["both_upstream"] = upstream_search
+        visited_predecessors = upstream_search.expand_to(current_depth)
 
         final_nodes.update(visited_predecessors)
-        logging.debug(f"Collected {len(visited_predecessors)} nodes from upstream analysis.")
+        if debug_enabled:
+            logging.debug(f"Collected {len(visited_predecessors)} nodes from upstream analysis.")
 
-    logging.debug(f"Final focused nodes count: {len(final_nodes)}")
+    if debug_enabled:
+        logging.debug(f"Final focused nodes count: {len(final_nodes)}")
 
-    focused_edges = {(u, v) for u, v in all_edges if u in final_nodes and v in final_nodes}
+    return final_nodes
 
-    return final_nodes, focused_edges
+
+def _sorted_edges(edges: set[tuple[str, str]]) -> list[tuple[str, str]]:
+    """
+    回傳與 sorted(edges) 相同順序的邊串列。
+    先依來源節點分組，再分別排序各組的目標節點，避免逐一比較整個元組。
+    """
+    targets_by_source: dict[str, list[str]] = defaultdict(list)
+    for u, v in edges:
+        targets_by_source[u].append(v)
+
+    result: list[tuple[str, str]] = []
+    for u in sorted(targets_by_source):
+        targets = targets_by_source[u]
+        targets.sort()
+        result.extend([(u, v) for v in targets])
+    return result
+
+
+def _focus_search_exhausted(bfs_states: dict[str, _IncrementalBFS], direction: str) -> bool:
+    """檢查指定方向的所有搜尋是否都已走遍可達節點。"""
+    keys = {"downstream": ("downstream",), "upstream": ("upstream",), "both": ("downstream", "both_upstream")}
+    return all(key in bfs_states and bfs_states[key].exhausted for key in keys.get(direction, ()))
 
 
 def build_component_graph_data(
@@ -104,23 +183,30 @@ def build_component_graph_data(
 
     if show_internal_calls:
         component_edges = call_graph
+        initial_nodes: set[str] = set(itertools.chain.from_iterable(call_graph))
     else:
-        component_edges = {(caller, callee) for caller, callee in call_graph if caller != callee}
-
-    initial_nodes: set[str] = set()
-    for caller, callee in component_edges:
-        initial_nodes.add(caller)
-        initial_nodes.add(callee)
+        # 過濾自我呼叫與收集節點共用同一次走訪。
+        component_edges = set()
+        initial_nodes = set()
+        for caller, callee in call_graph:
+            if caller != callee:
+                component_edges.add((caller, callee))
+                initial_nodes.add(caller)
+                initial_nodes.add(callee)
     if semantic_edges:
         for u, v, _ in semantic_edges:
             initial_nodes.add(u)
             initial_nodes.add(v)
     initial_nodes.update(all_components)
 
-    current_nodes, current_edges = initial_nodes, component_edges
+    current_nodes = initial_nodes
     current_semantic_edges = semantic_edges or set()
+    adjacency: _LazyAdjacency | None = None
 
     if focus_config and focus_config.get("entrypoints"):
+        adjacency = _LazyAdjacency(component_edges)
+        valid_entrypoints = {ep for ep in focus_config["entrypoints"] if ep in initial_nodes}
+        bfs_states: dict[str, _IncrementalBFS] = {}
         enable_dynamic_depth = focus_config.get("enable_dynamic_depth", True)
 
         current_direction = focus_config.get("direction", "both")
@@ -136,11 +222,12 @@ def build_component_graph_data(
             while current_depth <= max_search_depth:
                 logging.info(f"執行聚焦分析，當前深度: {current_depth} (模式: {current_direction})...")
 
-                current_iter_config = focus_config.copy()
-                current_iter_config["direction"] = current_direction
-
-                temp_nodes, temp_edges = _perform_focus_analysis(
-                    initial_nodes, component_edges, current_iter_config, current_depth
+                temp_nodes = _perform_focus_analysis(
+                    valid_entrypoints,
+                    current_direction,
+                    current_depth,
+                    adjacency,
+                    bfs_states,
                 )
 
                 if current_direction == "both" and len(temp_nodes) > max_nodes_bidirectional and auto_fallback:
@@ -150,70 +237,95 @@ def build_component_graph_data(
                     logging.warning("正在自動切換至 'downstream' (單向) 模式以防止圖表爆炸...")
 
                     current_direction = "downstream"
-                    current_iter_config["direction"] = "downstream"
 
-                    temp_nodes, temp_edges = _perform_focus_analysis(
-                        initial_nodes, component_edges, current_iter_config, current_depth
+                    temp_nodes = _perform_focus_analysis(
+                        valid_entrypoints,
+                        current_direction,
+                        current_depth,
+                        adjacency,
+                        bfs_states,
                     )
                     logging.info(f"切換至單向模式後，節點數降至: {len(temp_nodes)}")
 
                 if len(temp_nodes) >= min_nodes:
                     logging.info(f"找到 {len(temp_nodes)} 個節點 (>= {min_nodes})，停止增加深度。")
-                    current_nodes, current_edges = temp_nodes, temp_edges
+                    current_nodes = temp_nodes
                     break
 
-                current_nodes, current_edges = temp_nodes, temp_edges
+                current_nodes = temp_nodes
                 if current_depth == max_search_depth:
                     logging.warning(f"已達到最大搜索深度 ({max_search_depth})，但仍只有 {len(current_nodes)} 個節點。")
                     break
 
+                if _focus_search_exhausted(bfs_states, current_direction):
+                    logging.info(f"聚焦搜尋已涵蓋所有可達節點 ({len(temp_nodes)} 個)，增加深度不會改變結果，停止搜尋。")
+                    break
+
                 logging.info(f"只找到 {len(temp_nodes)} 個節點 (< {min_nodes})，自動增加深度...")
                 current_depth += 1
         else:
             fixed_depth = focus_config.get("initial_depth", 2)
-            current_iter_config = focus_config.copy()
-            current_iter_config["direction"] = current_direction
 
-            current_nodes, current_edges = _perform_focus_analysis(
-                initial_nodes, component_edges, current_iter_config, fixed_depth
+            current_nodes = _perform_focus_analysis(
+                valid_entrypoints,
+                current_direction,
+                fixed_depth,
+                adjacency,
+                bfs_states,
             )
 
             if current_direction == "both" and len(current_nodes) > max_nodes_bidirectional and auto_fallback:
                 logging.warning(f"固定深度分析節點數 ({len(current_nodes)}) 超過閾值，自動切換至 'downstream'。")
-                current_iter_config["direction"] = "downstream"
-                current_nodes, current_edges = _perform_focus_analysis(
-                    initial_nodes, component_edges, current_iter_config, fixed_depth
+                current_direction = "downstream"
+                current_nodes = _perform_focus_analysis(
+                    valid_entrypoints,
+                    current_direction,
+                    fixed_depth,
+                    adjacency,
+                    bfs_states,
                 )
 
     exclude_patterns = filtering_config.get("exclude_nodes", []) if filtering_config else []
-    if exclude_patterns:
-        final_nodes = set()
-        for node in current_nodes:
-            is_excluded = any(fnmatch.fnmatch(node, pattern) for pattern in exclude_patterns)
-            if not is_excluded:
-                final_nodes.add(node)
+    exclude_matcher = compile_fnmatch_patterns(exclude_patterns)
+    final_nodes = (
+        {node for node in current_nodes if not exclude_matcher.match(node)} if exclude_matcher else current_nodes
+    )
+
+    # 沒有任何節點被聚焦或排除移除時，所有邊的端點都仍在圖中，可直接沿用而不必逐一檢查。
+    # 聚焦模式已建立鄰接表，只需走訪保留節點的鄰接串列；其餘情況掃描一次所有邊。
+    if len(final_nodes) == len(initial_nodes):
+        final_edges = component_edges
+        final_semantic_edges = current_semantic_edges
     else:
-        final_nodes = current_nodes
-
-    final_edges = {
-        (caller, callee) for caller, callee in current_edges if caller in final_nodes and callee in final_nodes
-    }
-    final_semantic_edges = {
-        (u, v, label) for u, v, label in current_semantic_edges if u in final_nodes and v in final_nodes
-    }
-
-    nodes_by_module: dict[str, list[str]] = defaultdict(list)
-    for node in sorted(final_nodes):
+        if adjacency is not None:
+            final_edges = adjacency.edges_within(final_nodes)
+        else:
+            final_edges = {
+                (caller, callee)
+                for caller, callee in component_edges
+                if caller in final_nodes and callee in final_nodes
+            }
+        final_semantic_edges = {
+            (u, v, label) for u, v, label in current_semantic_edges if u in final_nodes and v in final_nodes
+        }
+
+    sorted_nodes = sorted(final_nodes)
+    nodes_by_module: dict[str, list[str]] = {}
+    for node in sorted_nodes:
         module_path = definition_to_module_map.get(node)
         if not module_path and "." in node:
             module_path = node.rsplit(".", 1)[0]
 
         if module_path:
-            nodes_by_module[module_path].append(node)
+            module_nodes = nodes_by_module.get(module_path)
+            if module_nodes is None:
+                nodes_by_module[module_path] = [node]
+            else:
+                module_nodes.append(node)
 
     return {
-        "nodes": sorted(final_nodes),
-        "edges": sorted(final_edges),
+        "nodes": sorted_nodes,
+        "edges": _sorted_edges(final_edges),
         "nodes_by_module": nodes_by_module,
         "docstrings": docstring_map,
         "semantic_edges": sorted(final_semantic_edges),
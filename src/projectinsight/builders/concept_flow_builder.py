@@ -13,12 +13,13 @@ from typing import Any
 # (無)
 
 
-def build_concept_flow_graph_data(analysis_results: dict[str, Any]) -> dict[str, Any]:
+def build_concept_flow_graph_data(analysis_results: dict[str, Any], sort_output: bool = True) -> dict[str, Any]:
     """
     將概念流動分析器的結果轉換為圖形資料結構。
 
     Args:
         analysis_results: 來自 concept_flow_parser 的分析結果。
+        sort_output: 是否排序節點與邊。輸出的 DOT 原始碼會寫入報告，需要穩定的順序時應保持開啟。
 
     Returns:
         一個包含節點和邊的圖形資料字典。
@@ -30,6 +31,9 @@ def build_concept_flow_graph_data(analysis_results: dict[str, Any]) -> dict[str,
         nodes.add(source)
         nodes.add(target)
 
+    if not sort_output:
+        return {"nodes": list(nodes), "edges": list(edges)}
+
     return {
         "nodes": sorted(nodes),
         "edges": sorted(edges),
@@ -4,6 +4,7 @@
 """
 
 # 1. 標準庫導入
+from operator import itemgetter
 from typing import Any
 
 # 2. 第三方庫導入
@@ -13,12 +14,13 @@ from typing import Any
 # (無)
 
 
-def build_dynamic_behavior_graph_data(analysis_results: dict[str, Any]) -> dict[str, Any]:
+def build_dynamic_behavior_graph_data(analysis_results: dict[str, Any], sort_output: bool = True) -> dict[str, Any]:
     """
     將動態行為分析器的結果轉換為圖形資料結構。
 
     Args:
         analysis_results: 來自 dynamic_behavior_analyzer 的分析結果。
+        sort_output: 是否依來源與目標排序邊。輸出的 DOT 原始碼會寫入報告，需要穩定的順序時應保持開啟。
 
     Returns:
         一個包含節點和邊的圖形資料字典。
@@ -37,5 +39,5 @@ def build_dynamic_behavior_graph_data(analysis_results: dict[str, Any]) -> dict[
 
     return {
         "nodes": nodes,
-        "edges": sorted(edges, key=lambda x: (x["source"], x["target"])),
+        "edges": sorted(edges, key=itemgetter("source", "target")) if sort_output else list(edges),
     }
@@ -8,12 +8,19 @@ ProjectInsight 的核心協調器套件。
 
 from .config_loader import ConfigLoader
 from .interactive_wizard import InteractiveWizard
-from .parallel_manager import ParallelManager
-from .project_processor import ProjectProcessor
+from .parallel_manager import ParallelManager, available_cpu_count, default_max_workers, set_worker_budget
+from .project_processor import ProjectProcessor, init_project_worker, run_project
+from .repo_manager_cache import get_full_repo_manager
 
 __all__ = [
     "ConfigLoader",
     "InteractiveWizard",
     "ParallelManager",
     "ProjectProcessor",
+    "available_cpu_count",
+    "default_max_workers",
+    "get_full_repo_manager",
+    "init_project_worker",
+    "run_project",
+    "set_worker_budget",
 ]
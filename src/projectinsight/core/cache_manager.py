@@ -4,6 +4,7 @@
 """
 
 # 1. 標準庫導入
+import concurrent.futures
 import contextlib
 import hashlib
 import logging
@@ -14,13 +15,15 @@ from typing import Any
 
 # 2. 第三方庫導入
 # (無)
-
 # 3. 本專案導入
-# (無)
+from projectinsight.core.parallel_manager import available_cpu_count
 
 # 快取版本號：當解析邏輯發生重大變更時，應升級此版本號以強制快取失效。
-CACHE_VERSION = "1.1.3"
+CACHE_VERSION = "1.1.6"
 CACHE_FILENAME = "analysis_cache.pkl"
+PROJECT_RESULTS_FILENAME = "project_results.pkl"
+# 小於此大小的檔案一次讀入後雜湊；原始碼檔案幾乎都落在此範圍內。
+SINGLE_READ_HASH_LIMIT = 1024 * 1024
 
 
 class CacheManager:
@@ -43,8 +46,12 @@ class CacheManager:
         self.cache_dir = cache_dir
         self.config_fingerprint = config_fingerprint
         self.cache_file_path = cache_dir / CACHE_FILENAME
+        self.project_results_path = cache_dir / PROJECT_RESULTS_FILENAME
         self.cache_data: dict[str, Any] = {}
         self.dirty = False
+        self._hash_cache: dict[str, str] = {}
+        self._path_cache: dict[Path, tuple[str, str | None]] = {}
+        self._stat_cache: dict[str, tuple[int, int] | None] = {}
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
@@ -59,20 +66,19 @@ class CacheManager:
 
         try:
             with open(self.cache_file_path, "rb") as f:
-                loaded_data = pickle.load(f)
-
-            meta = loaded_data.get("_meta", {})
-            if meta.get("version") != CACHE_VERSION:
-                logging.info(f"快取版本不匹配 (舊: {meta.get('version')}, 新: {CACHE_VERSION})，快取已失效。")
-                self.cache_data = {}
-                return
-
-            if meta.get("config_fingerprint") != self.config_fingerprint:
-                logging.info("設定檔已變更，快取已失效。")
-                self.cache_data = {}
-                return
-
-            self.cache_data = loaded_data.get("entries", {})
+                # 檔案開頭是獨立序列化的中繼資料，驗證通過後才反序列化其後的快取條目。
+                meta = pickle.load(f)
+                if meta.get("version") != CACHE_VERSION:
+                    logging.info(f"快取版本不匹配 (舊: {meta.get('version')}, 新: {CACHE_VERSION})，快取已失效。")
+                    self.cache_data = {}
+                    return
+
+                if meta.get("config_fingerprint") != self.config_fingerprint:
+                    logging.info("設定檔已變更，快取已失效。")
+                    self.cache_data = {}
+                    return
+
+                self.cache_data = pickle.load(f)
             logging.info(f"成功載入快取，包含 {len(self.cache_data)} 個檔案記錄。")
 
         except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
@@ -82,13 +88,24 @@ class CacheManager:
             logging.error(f"載入快取時發生未預期的錯誤: {e}")
             self.cache_data = {}
 
-    def _get_relative_key(self, file_path: Path) -> str | None:
+    def _resolve_path(self, file_path: Path) -> tuple[str, str | None]:
+        """
+        回傳檔案解析後的絕對路徑字串與相對路徑鍵。
+        Path.resolve() 需要檔案系統查詢，因此同一次執行中每個路徑只解析一次。
+        """
+        cached = self._path_cache.get(file_path)
+        if cached is None:
+            resolved_path_str = str(file_path.resolve())
+            cached = (resolved_path_str, self._get_relative_key(resolved_path_str))
+            self._path_cache[file_path] = cached
+        return cached
+
+    def _get_relative_key(self, resolved_path_str: str) -> str | None:
         """
         使用 os.path.relpath 計算相對路徑鍵，並轉為 POSIX 格式。
         這能解決 Windows 上 pathlib.relative_to 的大小寫敏感問題。
         """
         try:
-            resolved_path_str = str(file_path.resolve())
             rel_path = os.path.relpath(resolved_path_str, self.project_root_str)
 
             if rel_path.startswith(".."):
@@ -102,7 +119,7 @@ class CacheManager:
         """
         獲取指定檔案的快取資料。
         """
-        relative_path = self._get_relative_key(file_path)
+        resolved_path_str, relative_path = self._resolve_path(file_path)
         if not relative_path:
             return None
 
@@ -110,43 +127,154 @@ class CacheManager:
         if not entry:
             return None
 
-        current_hash = self._compute_file_hash(file_path.resolve())
+        file_stat = self._get_file_stat(resolved_path_str)
+        if file_stat is not None and entry.get("stat") == file_stat:
+            return entry.get("data")
+
+        current_hash = self._get_file_hash(resolved_path_str)
         if entry.get("hash") != current_hash:
             return None
 
+        # 內容未變但修改時間不同 (例如重新簽出)，記下新的狀態以免下次再計算雜湊值。
+        if file_stat is not None:
+            entry["stat"] = file_stat
+            self.dirty = True
         return entry.get("data")
 
     def update(self, file_path: Path, data: Any):
         """
         更新指定檔案的快取資料。
         """
-        relative_path = self._get_relative_key(file_path)
+        resolved_path_str, relative_path = self._resolve_path(file_path)
         if not relative_path:
             return
 
-        file_hash = self._compute_file_hash(file_path.resolve())
+        file_hash = self._get_file_hash(resolved_path_str)
         self.cache_data[relative_path] = {
             "hash": file_hash,
+            "stat": self._get_file_stat(resolved_path_str),
             "data": data,
         }
         self.dirty = True
 
+    def hash_many(self, file_paths: list[Path]):
+        """
+        以執行緒池平行計算多個檔案的雜湊值，並存入本次執行的雜湊快取。
+        讀檔與 hashlib 的雜湊運算都會釋放 GIL，因此多執行緒能有效利用多核心與磁碟頻寬。
+        修改時間與大小皆與快取記錄相符的檔案不需要雜湊值，因此會被略過。
+
+        Args:
+            file_paths: 要計算雜湊值的檔案路徑列表。
+        """
+        pending = []
+        for p in file_paths:
+            resolved_path_str, relative_path = self._resolve_path(p)
+            if resolved_path_str in self._hash_cache:
+                continue
+            entry = self.cache_data.get(relative_path) if relative_path else None
+            file_stat = self._get_file_stat(resolved_path_str)
+            if entry and file_stat is not None and entry.get("stat") == file_stat:
+                continue
+            pending.append(resolved_path_str)
+
+        if pending:
+            max_workers = min(32, available_cpu_count() * 4, len(pending))
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                self._hash_cache.update(zip(pending, executor.map(self._compute_file_hash, pending), strict=True))
+
+    def _compute_snapshot_key(self, file_paths: list[Path]) -> str:
+        """
+        以所有檔案的 (相對路徑, 修改時間, 大小) 計算整個檔案集合的快照鍵。
+        只需查詢檔案狀態，不必讀取任何檔案內容。
+        """
+        snapshot = sorted(
+            (relative_path or resolved_path_str, self._get_file_stat(resolved_path_str))
+            for resolved_path_str, relative_path in map(self._resolve_path, file_paths)
+        )
+        return hashlib.sha256(repr(snapshot).encode("utf-8")).hexdigest()
+
+    def load_project_results(self, file_paths: list[Path], variant_key: Any = None) -> Any | None:
+        """
+        若檔案集合自上次儲存後完全沒有變更，回傳當時儲存的整體分析結果，否則回傳 None。
+        variant_key 用於區分只影響整體結果、不影響單檔快取的設定，必須與儲存時相同。
+        """
+        if not self.project_results_path.exists():
+            return None
+
+        try:
+            with open(self.project_results_path, "rb") as f:
+                meta = pickle.load(f)
+                if (
+                    meta.get("version") != CACHE_VERSION
+                    or meta.get("config_fingerprint") != self.config_fingerprint
+                    or meta.get("variant_key") != variant_key
+                    or meta.get("snapshot_key") != self._compute_snapshot_key(file_paths)
+                ):
+                    return None
+                return pickle.load(f)
+        except Exception as e:
+            logging.warning(f"無法讀取整體分析結果快取，將重新分析: {e}")
+            return None
+
+    def save_project_results(self, file_paths: list[Path], results: Any, variant_key: Any = None):
+        """
+        將整體分析結果連同檔案集合的快照鍵寫入磁碟，供下一次未變更的執行直接沿用。
+        """
+        meta = {
+            "version": CACHE_VERSION,
+            "config_fingerprint": self.config_fingerprint,
+            "variant_key": variant_key,
+            "snapshot_key": self._compute_snapshot_key(file_paths),
+        }
+
+        temp_path = self.project_results_path.with_suffix(".tmp")
+        try:
+            with open(temp_path, "wb") as f:
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(results, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            os.replace(temp_path, self.project_results_path)
+            logging.debug(f"整體分析結果已儲存至: {self.project_results_path}")
+        except Exception as e:
+            logging.error(f"儲存整體分析結果時發生錯誤: {e}")
+            if temp_path.exists():
+                with contextlib.suppress(OSError):
+                    os.remove(temp_path)
+
+    def _get_file_stat(self, resolved_path_str: str) -> tuple[int, int] | None:
+        """
+        取得檔案的 (修改時間奈秒, 大小)，用於在不讀取內容的情況下判斷檔案是否變更。
+        同一次執行中每個檔案只查詢一次，讓記錄下的狀態與雜湊值對應同一份內容。
+        """
+        if resolved_path_str in self._stat_cache:
+            return self._stat_cache[resolved_path_str]
+        try:
+            st = os.stat(resolved_path_str)
+            file_stat = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            file_stat = None
+        self._stat_cache[resolved_path_str] = file_stat
+        return file_stat
+
+    def _get_file_hash(self, resolved_path_str: str) -> str:
+        """取得檔案雜湊值；同一次執行中每個檔案只計算一次。"""
+        file_hash = self._hash_cache.get(resolved_path_str)
+        if file_hash is None:
+            file_hash = self._compute_file_hash(resolved_path_str)
+            self._hash_cache[resolved_path_str] = file_hash
+        return file_hash
+
     def prune(self, current_files: list[Path]):
         """
         清理已不存在於當前檔案列表中的快取條目。
         """
-        current_keys = set()
-        for p in current_files:
-            key = self._get_relative_key(p)
-            if key:
-                current_keys.add(key)
+        current_keys = {self._resolve_path(p)[1] for p in current_files}
 
-        keys_to_remove = [k for k in self.cache_data if k not in current_keys]
-        if keys_to_remove:
-            for k in keys_to_remove:
-                del self.cache_data[k]
+        stale_count = len(self.cache_data.keys() - current_keys)
+        if stale_count:
+            self.cache_data = {k: v for k, v in self.cache_data.items() if k in current_keys}
             self.dirty = True
-            logging.debug(f"已清理 {len(keys_to_remove)} 個過期的快取條目。")
+            logging.debug(f"已清理 {stale_count} 個過期的快取條目。")
 
     def save(self):
         """
@@ -156,18 +284,16 @@ class CacheManager:
             logging.debug("快取未變更，跳過寫入。")
             return
 
-        payload = {
-            "_meta": {
-                "version": CACHE_VERSION,
-                "config_fingerprint": self.config_fingerprint,
-            },
-            "entries": self.cache_data,
+        meta = {
+            "version": CACHE_VERSION,
+            "config_fingerprint": self.config_fingerprint,
         }
 
         temp_path = self.cache_file_path.with_suffix(".tmp")
         try:
             with open(temp_path, "wb") as f:
-                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self.cache_data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
             os.replace(temp_path, self.cache_file_path)
             logging.info(f"快取已更新並儲存至: {self.cache_file_path}")
@@ -179,13 +305,15 @@ class CacheManager:
                     os.remove(temp_path)
 
     @staticmethod
-    def _compute_file_hash(file_path: Path) -> str:
-        """計算檔案內容的 MD5 雜湊值。"""
-        hasher = hashlib.md5()
+    def _compute_file_hash(file_path: Path | str) -> str:
+        """
+        計算檔案內容的 SHA-256 雜湊值。
+        小檔案以無緩衝的單次 read 讀入後直接雜湊；大檔案交由 hashlib.file_digest 在 C 層級分塊處理。
+        """
         try:
-            with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
-            return hasher.hexdigest()
+            with open(file_path, "rb", buffering=0) as f:
+                if os.fstat(f.fileno()).st_size <= SINGLE_READ_HASH_LIMIT:
+                    return hashlib.sha256(f.read()).hexdigest()
+                return hashlib.file_digest(f, "sha256").hexdigest()
         except OSError:
             return ""
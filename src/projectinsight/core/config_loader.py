@@ -5,8 +5,10 @@
 
 # 1. 標準庫導入
 import colorsys
-import copy
+import functools
 import logging
+import os
+import pickle
 import random
 from pathlib import Path
 from typing import Any
@@ -18,6 +20,11 @@ from ruamel.yaml import YAML
 # 3. 本專案導入
 from projectinsight.utils.path_utils import find_top_level_packages
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
 DEFAULT_PARSER_CONFIG: dict[str, Any] = {
     "alias_resolution": {
         "exclude_patterns": [
@@ -104,6 +111,36 @@ DEFAULT_VIS_CONFIG: dict[str, Any] = {
     },
 }
 
+# 預設設定只由純量、串列與字典組成，在導入時序列化一次；
+# 之後以 pickle.loads 產生獨立副本，比每次呼叫 copy.deepcopy 快得多。
+_DEFAULT_PARSER_CONFIG_PICKLE = pickle.dumps(DEFAULT_PARSER_CONFIG, protocol=pickle.HIGHEST_PROTOCOL)
+_DEFAULT_VIS_CONFIG_PICKLE = pickle.dumps(DEFAULT_VIS_CONFIG, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@functools.cache
+def _discover_package_keys(base_path: Path, prefix: str | None) -> tuple[str, ...]:
+    """
+    遞迴地掃描給定目錄的所有子套件，回傳以點分隔的套件路徑。
+    結果依目錄記憶化：同一程序中依序處理多個指向同一專案的設定檔時，每個設定檔都會重新執行自動發現，
+    而目標專案的目錄結構在同一次執行中不會改變。
+    """
+    if not base_path.is_dir():
+        return ()
+
+    layer_keys = [prefix] if prefix else []
+    try:
+        with os.scandir(base_path) as it:
+            package_names = sorted(
+                entry.name for entry in it if entry.is_dir() and os.path.exists(os.path.join(entry.path, "__init__.py"))
+            )
+        for name in package_names:
+            layer_key = f"{prefix}.{name}" if prefix else name
+            layer_keys.extend(_discover_package_keys(base_path / name, layer_key))
+        return tuple(layer_keys)
+    except OSError as e:
+        logging.warning(f"自動發現架構層級時發生錯誤: {e}")
+        return ()
+
 
 class ConfigLoader:
     """一個處理設定檔載入、合併與自動發現的類別。"""
@@ -122,7 +159,7 @@ class ConfigLoader:
             return None
         try:
             with open(path, encoding="utf-8") as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_SafeLoader)
         except yaml.YAMLError as e:
             logging.error(f"解析設定檔 '{path.name}' 時發生錯誤: {e}")
             return None
@@ -130,10 +167,12 @@ class ConfigLoader:
     def _process_config(self):
         """處理載入後的設定，進行合併和自動發現。"""
         user_parser_config = self.config.get("parser_settings", {})
-        self.config["parser_settings"] = self._merge_configs(copy.deepcopy(DEFAULT_PARSER_CONFIG), user_parser_config)
+        self.config["parser_settings"] = self._merge_configs(
+            pickle.loads(_DEFAULT_PARSER_CONFIG_PICKLE), user_parser_config
+        )
 
         user_vis_config = self.config.get("visualization", {})
-        self.config["visualization"] = self._merge_configs(copy.deepcopy(DEFAULT_VIS_CONFIG), user_vis_config)
+        self.config["visualization"] = self._merge_configs(pickle.loads(_DEFAULT_VIS_CONFIG_PICKLE), user_vis_config)
 
         target_project_path_str = self.config.get("target_project_path")
         if not target_project_path_str:
@@ -175,12 +214,22 @@ class ConfigLoader:
 
     @staticmethod
     def _merge_configs(default: dict, user: dict) -> dict:
-        """遞迴地合併使用者設定到預設設定中。"""
-        for key, value in user.items():
-            if isinstance(value, dict) and isinstance(default.get(key), dict):
-                default[key] = ConfigLoader._merge_configs(default[key], value)
-            else:
-                default[key] = value
+        """
+        將使用者設定逐層合併到預設設定中 (就地修改並回傳 default)。
+        以堆疊代替遞迴處理巢狀字典。
+        """
+        if not user:
+            return default
+
+        stack = [(default, user)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                target_value = target.get(key)
+                if isinstance(value, dict) and isinstance(target_value, dict):
+                    stack.append((target_value, value))
+                else:
+                    target[key] = value
         return default
 
     @staticmethod
@@ -192,13 +241,11 @@ class ConfigLoader:
         golden_ratio_conjugate = 0.61803398875
         hue = random.random()
         for _ in range(num_colors):
-            hue += golden_ratio_conjugate
-            hue %= 1
+            hue = (hue + golden_ratio_conjugate) % 1
             lightness = random.uniform(0.75, 0.95)
             saturation = random.uniform(0.7, 0.9)
-            rgb_float = colorsys.hls_to_rgb(hue, lightness, saturation)
-            rgb_int = tuple(int(c * 255) for c in rgb_float)
-            palette.append(f"#{rgb_int[0]:02x}{rgb_int[1]:02x}{rgb_int[2]:02x}")
+            r, g, b = colorsys.hls_to_rgb(hue, lightness, saturation)
+            palette.append(f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}")
         return palette
 
     def _assign_colors_to_layers(self, layer_keys: list[str]) -> dict[str, Any]:
@@ -210,24 +257,33 @@ class ConfigLoader:
         logging.info(f"自動為 {len(auto_layers)} 個架構層級分配顏色: {', '.join(auto_layers.keys())}")
         return auto_layers
 
-    def _discover_sub_packages(self, base_path: Path, prefix: str | None = None) -> dict[str, Any]:
+    @staticmethod
+    def _discover_sub_packages(base_path: Path, prefix: str | None = None) -> dict[str, Any]:
         """遞迴地掃描給定目錄的所有子套件，並以點分隔的路徑作為鍵。"""
-        layers = {}
-        if not base_path.is_dir():
-            return layers
+        return {layer_key: {} for layer_key in _discover_package_keys(base_path, prefix)}
 
-        if prefix:
-            layers[prefix] = {}
+    def apply_updates(self, updates: dict[str, Any]):
+        """
+        將與 update_config_file 相同格式的點分隔更新直接套用到記憶體中的設定，
+        效果等同寫入設定檔後重新載入，但省去重新解析 YAML 與重新執行自動發現。
+        與重新載入時相同，被取代的字典區段會再與對應的預設值合併。
+        """
+        defaults = {
+            "parser_settings": pickle.loads(_DEFAULT_PARSER_CONFIG_PICKLE),
+            "visualization": pickle.loads(_DEFAULT_VIS_CONFIG_PICKLE),
+        }
+        for key, value in updates.items():
+            keys = key.split(".")
+            d = self.config
+            default_section: Any = defaults
+            for k in keys[:-1]:
+                d = d.setdefault(k, {})
+                default_section = default_section.get(k) if isinstance(default_section, dict) else None
 
-        try:
-            for item in sorted(base_path.iterdir()):
-                if item.is_dir() and (item / "__init__.py").exists():
-                    layer_key = f"{prefix}.{item.name}" if prefix else item.name
-                    layers.update(self._discover_sub_packages(item, layer_key))
-            return layers
-        except OSError as e:
-            logging.warning(f"自動發現架構層級時發生錯誤: {e}")
-            return {}
+            default_value = default_section.get(keys[-1]) if isinstance(default_section, dict) else None
+            if isinstance(value, dict) and isinstance(default_value, dict):
+                value = self._merge_configs(default_value, value)
+            d[keys[-1]] = value
 
     @staticmethod
     def update_config_file(config_path: Path, updates: dict[str, Any]):
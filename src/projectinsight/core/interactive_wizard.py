@@ -6,7 +6,11 @@
 
 # 1. 標準庫導入
 import fnmatch
+import heapq
 import logging
+import re
+from collections.abc import Callable
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
@@ -16,6 +20,84 @@ import networkx as nx
 # 3. 本專案導入
 from projectinsight.core.config_loader import ConfigLoader
 
+_BONUS_PATTERNS: dict[str, float] = {
+    "*main*": 1.5,
+    "*app*": 1.5,
+    "*application*": 1.5,
+    "*api*": 1.3,
+    "*router*": 1.3,
+    "*server*": 1.3,
+    "*cli*": 1.3,
+    "*manage*": 1.3,
+    "*handler*": 1.3,
+    "*wsgi*": 1.3,
+    "*asgi*": 1.3,
+    "*core*": 1.2,
+    "*base*": 1.1,
+    "*model*": 1.1,
+    "*frame*": 1.2,
+    "*index*": 1.1,
+    "*session*": 1.1,
+    "*engine*": 1.1,
+}
+
+_PENALTY_PATTERNS: dict[str, float] = {
+    "*test*": 0.05,
+    "*docs*": 0.05,
+    "*example*": 0.1,
+    "*scripts*": 0.1,
+    "*utils*": 0.5,
+    "*common*": 0.5,
+    "*helper*": 0.5,
+    "*__init__": 0.2,
+    "*types*": 0.3,
+    "*exceptions*": 0.3,
+    "*error*": 0.3,
+    "*property*": 0.5,
+    "*filters*": 0.5,
+    "*admin*": 0.8,
+    "*decorator*": 0.2,
+    "*validator*": 0.3,
+    "*compat*": 0.3,
+}
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def _compile_score_patterns(patterns: dict[str, float]) -> list[tuple[str, Callable[[str], Any] | None, float]]:
+    """
+    將評分用的萬用字元模式預先編譯為 (字面值, 比對函式, 乘數)。
+    形如 '*keyword*' 的模式等同子字串檢查，比對函式為 None，以 `in` 直接判斷，比正規表示式快一個數量級；
+    其餘模式才轉為正規表示式。
+    """
+    compiled = []
+    for pattern, factor in patterns.items():
+        literal = pattern[1:-1]
+        if len(pattern) >= 2 and pattern[0] == "*" and pattern[-1] == "*" and not _WILDCARD_CHARS.intersection(literal):
+            compiled.append((literal, None, factor))
+        else:
+            compiled.append((pattern, re.compile(fnmatch.translate(pattern)).match, factor))
+    return compiled
+
+
+# 模式固定不變，在導入時一次編譯，評分時便不需每個節點都經過 fnmatch 的轉譯與快取查詢。
+_COMPILED_BONUS_PATTERNS = _compile_score_patterns(_BONUS_PATTERNS)
+_COMPILED_PENALTY_PATTERNS = _compile_score_patterns(_PENALTY_PATTERNS)
+
+
+def _has_private_part(fqn: str) -> bool:
+    """
+    判斷 FQN 中是否有以單一底線開頭的路徑段 (不含 __dunder__ 名稱)。
+    以 str.find 直接尋找 '._'，不需將 FQN 切分成串列。
+    """
+    dotted = "." + fqn
+    index = dotted.find("._")
+    while index != -1:
+        if dotted[index + 2 : index + 3] != "_":
+            return True
+        index = dotted.find("._", index + 3)
+    return False
+
 
 class InteractiveWizard:
     """
@@ -26,12 +108,23 @@ class InteractiveWizard:
     def __init__(self, config_path: Path, project_root: Path):
         self.config_path = config_path
         self.project_root = project_root
-        self.sorted_candidates: list[tuple[str, float]] = []
+        self.candidate_scores: dict[str, float] = {}
+        self._analyzed_input: tuple[dict[str, Any], tuple[str, ...]] | None = None
 
     def analyze_graph_and_recommend(self, graph_data: dict[str, Any], context_packages: list[str]):
         """
         基於傳入的圖資料構建 NetworkX 圖，並計算混合中心性分數。
+        精靈在使用者重試時會以同一份圖資料再次執行，此時直接沿用上一次的排序結果。
         """
+        context_key = tuple(context_packages)
+        if (
+            self._analyzed_input is not None
+            and self._analyzed_input[0] is graph_data
+            and self._analyzed_input[1] == context_key
+        ):
+            logging.debug("[Wizard] 圖資料未變更，沿用上一次的推薦結果。")
+            return
+
         logging.info("--- [Wizard] 正在基於真實呼叫圖進行拓撲分析 (PageRank + Out-Degree) ---")
 
         G = nx.DiGraph()
@@ -71,99 +164,66 @@ class InteractiveWizard:
         max_pr = max(pagerank_scores.values()) if pagerank_scores else 1.0
         max_od = max(out_degree_scores.values()) if out_degree_scores else 1.0
 
-        bonus_patterns = {
-            "*main*": 1.5,
-            "*app*": 1.5,
-            "*application*": 1.5,
-            "*api*": 1.3,
-            "*router*": 1.3,
-            "*server*": 1.3,
-            "*cli*": 1.3,
-            "*manage*": 1.3,
-            "*handler*": 1.3,
-            "*wsgi*": 1.3,
-            "*asgi*": 1.3,
-            "*core*": 1.2,
-            "*base*": 1.1,
-            "*model*": 1.1,
-            "*frame*": 1.2,
-            "*index*": 1.1,
-            "*session*": 1.1,
-            "*engine*": 1.1,
-        }
-
-        penalty_patterns = {
-            "*test*": 0.05,
-            "*docs*": 0.05,
-            "*example*": 0.1,
-            "*scripts*": 0.1,
-            "*utils*": 0.5,
-            "*common*": 0.5,
-            "*helper*": 0.5,
-            "*__init__": 0.2,
-            "*types*": 0.3,
-            "*exceptions*": 0.3,
-            "*error*": 0.3,
-            "*property*": 0.5,
-            "*filters*": 0.5,
-            "*admin*": 0.8,
-            "*decorator*": 0.2,
-            "*validator*": 0.3,
-            "*compat*": 0.3,
-        }
-
+        isolated_nodes = set(nx.isolates(G))
         for node in G.nodes():
-            is_internal = any(node.startswith(pkg) for pkg in context_packages)
-            if not is_internal:
+            if not node.startswith(context_key):
                 continue
 
-            parts = node.split(".")
-            has_private_part = False
-            for part in parts:
-                if part.startswith("_") and not part.startswith("__"):
-                    has_private_part = True
-                    break
+            has_private_part = _has_private_part(node)
 
             pr_norm = pagerank_scores.get(node, 0) / max_pr
             od_norm = out_degree_scores.get(node, 0) / max_od
             base_score = (pr_norm * 0.4 + od_norm * 0.6) * 100
 
             multiplier = 1.0
-            for pattern, bonus in bonus_patterns.items():
-                if fnmatch.fnmatch(node.lower(), pattern):
+            node_lower = node.lower()
+            for literal, match, bonus in _COMPILED_BONUS_PATTERNS:
+                if match(node_lower) if match else literal in node_lower:
                     multiplier *= bonus
 
-            for pattern, penalty in penalty_patterns.items():
-                if fnmatch.fnmatch(node.lower(), pattern):
+            for literal, match, penalty in _COMPILED_PENALTY_PATTERNS:
+                if match(node_lower) if match else literal in node_lower:
                     multiplier *= penalty
 
             if has_private_part:
                 multiplier *= 0.3
 
-            short_name = node.split(".")[-1]
+            short_name = node.rpartition(".")[2]
             if short_name and short_name[0].isupper() and "_" not in short_name:
                 multiplier *= 1.2
 
             final_score = base_score * multiplier
 
-            if G.degree(node) == 0:
+            if node in isolated_nodes:
                 final_score *= 0.1
 
             final_scores[node] = final_score
 
-        self.sorted_candidates = sorted(final_scores.items(), key=lambda item: item[1], reverse=True)
+        self.candidate_scores = final_scores
+        self._analyzed_input = (graph_data, context_key)
 
-        logging.debug("--- [Wizard] Top 10 推薦候選者 (已過濾外部依賴) ---")
-        for i, (fqn, score) in enumerate(self.sorted_candidates[:10]):
-            logging.debug(f"  {i + 1}. {fqn} (Score: {score:.2f})")
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("--- [Wizard] Top 10 推薦候選者 (已過濾外部依賴) ---")
+            for i, (fqn, score) in enumerate(self.top_candidates(10)):
+                logging.debug(f"  {i + 1}. {fqn} (Score: {score:.2f})")
+
+    def top_candidates(self, count: int) -> list[tuple[str, float]]:
+        """
+        回傳分數最高的前 count 個候選者，順序與對全部分數做穩定降冪排序後取前 count 個相同。
+        選單只會顯示少數推薦，因此以 heapq.nlargest 取代完整排序。
+        """
+        return heapq.nlargest(count, self.candidate_scores.items(), key=itemgetter(1))
 
     def run(
         self,
         graph_data: dict[str, Any],
         context_packages: list[str],
         failed_attempts: list[str] | None = None,
-    ) -> str:
-        """執行互動式精靈。"""
+    ) -> tuple[str, dict[str, Any]]:
+        """
+        執行互動式精靈。
+        回傳 (動作, 已寫入設定檔的更新)，呼叫端可將同一份更新直接套用到記憶體中的設定。
+        """
         self.analyze_graph_and_recommend(graph_data, context_packages)
 
         if failed_attempts:
@@ -172,7 +232,8 @@ class InteractiveWizard:
             logging.info("這通常意味著它是一個代理、孤立的組件或過於簡單。請嘗試其他選項。")
             print("-" * 60)
 
-        filtered_candidates = [cand for cand in self.sorted_candidates if cand[0] not in (failed_attempts or [])]
+        excluded = set(failed_attempts or [])
+        filtered_candidates = [cand for cand in self.top_candidates(len(excluded) + 5) if cand[0] not in excluded]
         recommendations = [cand for cand in filtered_candidates if cand[1] > 0][:5]
 
         node_count = len(graph_data.get("nodes", []))
@@ -181,7 +242,7 @@ class InteractiveWizard:
         updates, action = self._get_user_choice(recommendations)
         if updates:
             ConfigLoader.update_config_file(self.config_path, updates)
-        return action
+        return action, updates
 
     @staticmethod
     def _display_menu(node_count: int, recommendations: list[tuple[str, float]]):
@@ -10,6 +10,7 @@
 
 # 1. 標準庫導入
 import concurrent.futures
+import functools
 import logging
 import multiprocessing
 import os
@@ -26,6 +27,49 @@ T = TypeVar("T")  # 輸入項目類型
 R = TypeVar("R")  # 回傳結果類型
 
 
+def available_cpu_count() -> int:
+    """
+    回傳目前程序實際可使用的 CPU 數量。
+    在容器或 CI 等限制 CPU 親和性的環境中，os.cpu_count() 會回報整台主機的核心數而造成過量的工作程序；
+    支援 sched_getaffinity 的平台改以其結果為準。
+    """
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+# 本程序中 ParallelManager 預設可使用的工作程序上限。平行處理多個專案時由外層為每個專案子程序設定，
+# 避免每個專案各自啟動等同 CPU 數量的工作程序，使總程序數成為專案數乘以 CPU 數。
+_worker_budget: int | None = None
+
+
+def set_worker_budget(max_workers: int | None):
+    """設定本程序中 ParallelManager 預設的工作程序上限；None 表示使用全部可用的 CPU。"""
+    global _worker_budget
+    _worker_budget = max_workers
+
+
+def default_max_workers() -> int:
+    """回傳 ParallelManager 預設的工作程序數：已設定預算時使用預算，否則為可用的 CPU 數量。"""
+    return _worker_budget or available_cpu_count()
+
+
+# 工作程序內的唯讀上下文，由 initializer 在每個工作程序啟動時設定一次。
+_worker_context: dict[str, Any] = {}
+
+
+def _init_worker(global_context: dict[str, Any]):
+    """[Worker] 保存本次平行任務共用的上下文。"""
+    global _worker_context
+    _worker_context = global_context
+
+
+def _run_task(task_func: Callable[..., R], item: Any) -> R:
+    """[Worker] 以工作程序保存的上下文呼叫任務函式，維持 task_func((item, context)) 的呼叫慣例。"""
+    return task_func((item, _worker_context))
+
+
 class ParallelManager:
     """
     管理平行化解析任務的核心類別。
@@ -36,9 +80,9 @@ class ParallelManager:
         初始化 ParallelManager。
 
         Args:
-            max_workers: 最大工作程序數。若為 None，則預設為 CPU 核心數。
+            max_workers: 最大工作程序數。若為 None，則使用 default_max_workers() (工作程序預算或可用的 CPU 核心數)。
         """
-        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_workers = max_workers or default_max_workers()
         self.mp_context = multiprocessing.get_context("spawn")
 
     def execute_map_reduce(
@@ -69,14 +113,16 @@ class ParallelManager:
 
         logging.info(f"啟動平行處理: {total_items} 個項目, {self.max_workers} 個工作程序 (Chunksize: {chunksize})")
 
-        task_args = ((item, global_context) for item in items)
-
+        # 上下文 (別名表、組件集合等) 可能很大；透過 initializer 每個工作程序只傳送一次，
+        # 而非隨每個任務區塊重複序列化。
         try:
             with concurrent.futures.ProcessPoolExecutor(
                 max_workers=self.max_workers,
                 mp_context=self.mp_context,
+                initializer=_init_worker,
+                initargs=(global_context,),
             ) as executor:
-                futures = executor.map(task_func, task_args, chunksize=chunksize)
+                futures = executor.map(functools.partial(_run_task, task_func), items, chunksize=chunksize)
 
                 for i, result in enumerate(futures):
                     results.append(result)
@@ -4,6 +4,7 @@ ProjectInsight 的核心處理引擎。
 """
 
 # 1. 標準庫導入
+import concurrent.futures
 import hashlib
 import json
 import logging
@@ -21,6 +22,7 @@ from projectinsight.builders.dynamic_behavior_builder import build_dynamic_behav
 from projectinsight.core.cache_manager import CacheManager
 from projectinsight.core.config_loader import ConfigLoader
 from projectinsight.core.interactive_wizard import InteractiveWizard
+from projectinsight.core.parallel_manager import available_cpu_count, set_worker_budget
 from projectinsight.parsers import component_parser, concept_flow_analyzer, seed_discoverer
 from projectinsight.renderers.component_renderer import render_component_graph
 from projectinsight.renderers.concept_flow_renderer import (
@@ -33,6 +35,8 @@ from projectinsight.renderers.dynamic_behavior_renderer import (
 )
 from projectinsight.reporters.markdown_reporter import generate_markdown_report
 from projectinsight.semantics import dynamic_behavior_analyzer, semantic_link_analyzer
+from projectinsight.utils.file_system_utils import iter_files
+from projectinsight.utils.logging_utils import configure_logging
 from projectinsight.utils.path_utils import find_top_level_packages
 
 ASSESSMENT_THRESHOLDS = {
@@ -87,11 +91,6 @@ class ProjectProcessor:
         logging.info(f"專案報告根目錄: {target_project_root}")
         logging.info(f"Python 原始碼分析根目錄: {python_source_root}")
 
-        config_fingerprint = self._compute_config_fingerprint()
-        cache_dir = output_dir / ".cache"
-        cache_manager = CacheManager(target_project_root, cache_dir, config_fingerprint)
-        cache_manager.load()
-
         context_packages: list[str]
         root_package_name_override = self.config.get("root_package_name")
         if root_package_name_override:
@@ -105,61 +104,70 @@ class ProjectProcessor:
             logging.error("無法確定專案的解析上下文。請檢查專案結構，或在設定檔中手動指定 `root_package_name`。")
             return
 
-        py_files_in_context: set[Path] = set()
-        all_py_files_in_root = list(python_source_root.rglob("*.py"))
-        context_packages_tuple = tuple(context_packages)
+        # 所有設定檢查都通過後才建立輸出目錄，無效的設定不會留下空目錄。
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-        for py_file in all_py_files_in_root:
-            try:
-                relative_path_parts = py_file.relative_to(python_source_root).parts
-                if not relative_path_parts:
-                    continue
-
-                if relative_path_parts[-1] == "__init__.py":
-                    module_path = ".".join(relative_path_parts[:-1])
-                else:
-                    module_path = ".".join(relative_path_parts).removesuffix(".py")
-
-                if module_path.startswith(context_packages_tuple):
-                    py_files_in_context.add(py_file)
-            except ValueError:
-                continue
-        py_files = sorted(py_files_in_context)
-        logging.info(f"在解析上下文中找到 {len(py_files)} 個 Python 檔案進行分析。")
+        config_fingerprint = self._compute_config_fingerprint()
+        cache_dir = output_dir / ".cache"
+        cache_manager = CacheManager(target_project_root, cache_dir, config_fingerprint)
+        cache_manager.load()
 
-        logging.info("--- [Phase 1] 執行快速 AST 掃描 ---")
-        scan_results = component_parser.quick_ast_scan(python_source_root, py_files, context_packages)
+        py_files = self._collect_context_py_files(python_source_root, context_packages)
+        logging.info(f"在解析上下文中找到 {len(py_files)} 個 Python 檔案進行分析。")
+        # 是否執行語義分析只影響整體結果，不影響單檔快取，因此不列入設定指紋，只用來區分整體結果快取。
+        needs_semantic_analysis = self._needs_semantic_analysis()
+        # 檔案集合與設定都未變更時，直接沿用上次的整體結果，略過 Phase 1 ~ 4 的全部解析。
+        cached_results = cache_manager.load_project_results(py_files, variant_key=needs_semantic_analysis)
+        if cached_results is not None:
+            logging.info("--- [Phase 1 ~ 4] 原始碼自上次分析後未變更，沿用快取的解析結果 ---")
+            parser_results, semantic_results = cached_results
+        else:
+            cache_manager.hash_many(py_files)
 
-        repo_manager = None
+            logging.info("--- [Phase 1] 執行快速 AST 掃描 ---")
+            scan_results = component_parser.quick_ast_scan(python_source_root, py_files, context_packages)
 
-        logging.info("--- [Phase 2 & 3] 執行完整程式碼解析 (Parallel LibCST + Incremental Cache) ---")
-        parser_settings = self.config.get("parser_settings", {})
-        alias_resolution_settings = parser_settings.get("alias_resolution", {})
+            repo_manager = None
 
-        project_root_str = str(python_source_root.resolve())
+            logging.info("--- [Phase 2 & 3] 執行完整程式碼解析 (Parallel LibCST + Incremental Cache) ---")
+            parser_settings = self.config.get("parser_settings", {})
+            alias_resolution_settings = parser_settings.get("alias_resolution", {})
 
-        parser_results = component_parser.full_libcst_analysis(
-            repo_manager=repo_manager,
-            context_packages=context_packages,
-            pre_scan_results=scan_results["pre_scan_results"],
-            initial_definition_map=scan_results["definition_to_module_map"],
-            alias_exclude_patterns=alias_resolution_settings.get("exclude_patterns", []),
-            cache_manager=cache_manager,
-            project_root=project_root_str,
-        )
+            project_root_str = str(python_source_root.resolve())
 
-        logging.info("--- [Phase 4] 執行靜態語義連結分析 (Parallel) ---")
-        semantic_results = semantic_link_analyzer.analyze_semantic_links(
-            repo_manager=repo_manager,
-            pre_scan_results=scan_results["pre_scan_results"],
-            context_packages=context_packages,
-            all_components=parser_results.get("components", set()),
-            cache_manager=cache_manager,
-            project_root=project_root_str,
-        )
+            parser_results = component_parser.full_libcst_analysis(
+                repo_manager=repo_manager,
+                context_packages=context_packages,
+                pre_scan_results=scan_results["pre_scan_results"],
+                initial_definition_map=scan_results["definition_to_module_map"],
+                alias_exclude_patterns=alias_resolution_settings.get("exclude_patterns", []),
+                cache_manager=cache_manager,
+                project_root=project_root_str,
+            )
 
-        cache_manager.prune(py_files)
-        cache_manager.save()
+            if needs_semantic_analysis:
+                logging.info("--- [Phase 4] 執行靜態語義連結分析 (Parallel) ---")
+                semantic_results = semantic_link_analyzer.analyze_semantic_links(
+                    repo_manager=repo_manager,
+                    pre_scan_results=scan_results["pre_scan_results"],
+                    context_packages=context_packages,
+                    all_components=parser_results.get("components", set()),
+                    cache_manager=cache_manager,
+                    project_root=project_root_str,
+                )
+            else:
+                logging.info("--- [Phase 4] 本次設定不會使用語義連結，已跳過靜態語義連結分析 ---")
+                semantic_results = {"semantic_edges": set(), "complete": True}
+
+            cache_manager.prune(py_files)
+            cache_manager.save()
+            # 只有在所有階段都完整完成時才寫入整體結果快取，否則之後的執行會一直沿用不完整的結果。
+            if parser_results.get("complete") and semantic_results.get("complete"):
+                cache_manager.save_project_results(
+                    py_files, (parser_results, semantic_results), variant_key=needs_semantic_analysis
+                )
+            else:
+                logging.warning("部分解析階段未能完整完成，本次結果不會寫入整體結果快取。")
 
         full_graph_data = build_component_graph_data(
             call_graph=parser_results.get("call_graph", set()),
@@ -179,13 +187,13 @@ class ProjectProcessor:
 
             failed_attempts: list[str] = []
             while True:
-                action = wizard.run(full_graph_data, context_packages, failed_attempts)
+                action, updates = wizard.run(full_graph_data, context_packages, failed_attempts)
                 if action == "exit":
                     logging.info("使用者選擇退出。")
                     return
 
-                self.config_loader = ConfigLoader(self.config_path)
-                self.config = self.config_loader.config
+                # self.config 與 self.config_loader.config 是同一個字典，就地更新即可，不需重新載入設定檔。
+                self.config_loader.apply_updates(updates)
 
                 if self.config.get("force_analysis") or self.config.get("visualization", {}).get(
                     "component_interaction_graph", {}
@@ -204,18 +212,29 @@ class ProjectProcessor:
         docstring_map = parser_results.get("docstring_map", {})
         report_analysis_results: dict[str, Any] = {}
 
-        for analysis_type in analysis_types:
-            self._run_analysis(
-                analysis_type,
-                py_files,
-                python_source_root,
-                parser_results,
-                semantic_results,
-                docstring_map,
-                report_analysis_results,
-                output_dir,
-                context_packages,
-            )
+        # 各分析類型只讀取共用的解析結果，並寫入各自的報告欄位與圖檔；
+        # 其耗時主要在 Graphviz 子程序與檔案 I/O，因此以執行緒並行執行。
+        max_workers = min(len(analysis_types), available_cpu_count())
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self._run_analysis,
+                    analysis_type,
+                    py_files,
+                    python_source_root,
+                    parser_results,
+                    semantic_results,
+                    docstring_map,
+                    output_dir,
+                    context_packages,
+                ): analysis_type
+                for analysis_type in analysis_types
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    report_analysis_results.update(future.result())
+                except Exception as e:
+                    logging.error(f"執行分析 '{futures[future]}' 時發生錯誤: {e}", exc_info=True)
 
         if report_analysis_results:
             report_output_path = output_dir / f"{self.project_name}_InsightReport.md"
@@ -282,7 +301,6 @@ class ProjectProcessor:
         if not output_dir_str:
             return None, None, None
         output_dir = (config_dir / output_dir_str).resolve()
-        os.makedirs(output_dir, exist_ok=True)
 
         root_package_name = self.config.get("root_package_name")
         common_layout_dirs = ["src", "lib"]
@@ -311,19 +329,80 @@ class ProjectProcessor:
         logging.info("未偵測到標準佈局，將使用專案根目錄作為 Python 原始碼路徑。")
         return target_project_root, target_project_root, output_dir
 
+    @staticmethod
+    def _collect_context_py_files(python_source_root: Path, context_packages: list[str]) -> list[Path]:
+        """
+        收集模組路徑落在解析上下文中的所有 Python 檔案，並依路徑排序。
+        頂層目錄在走訪前先依名稱判斷其下的模組路徑是否可能以某個上下文套件開頭，
+        不可能的目錄 (如 tests、docs 或虛擬環境) 整個子樹都不會被走訪。
+        """
+        context_packages_tuple = tuple(context_packages)
+        root_str = os.fspath(python_source_root)
+        prefix_len = len(os.path.join(root_str, ""))
+
+        search_dirs: list[str] = []
+        candidate_paths: list[str] = []
+        try:
+            with os.scandir(root_str) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        name = entry.name
+                        if name.startswith(context_packages_tuple) or any(
+                            pkg.startswith(f"{name}.") for pkg in context_packages
+                        ):
+                            search_dirs.append(entry.path)
+                    elif entry.name.endswith(".py") and entry.is_file():
+                        candidate_paths.append(entry.path)
+        except OSError as e:
+            logging.warning(f"掃描 Python 原始碼目錄時發生錯誤: {e}")
+            return []
+
+        for directory in search_dirs:
+            candidate_paths.extend(
+                entry.path for entry in iter_files(Path(directory), ("__pycache__",)) if entry.name.endswith(".py")
+            )
+
+        py_files_in_context: list[Path] = []
+        for path_str in candidate_paths:
+            relative_path_parts = path_str[prefix_len:].split(os.sep)
+            if relative_path_parts[-1] == "__init__.py":
+                module_path = ".".join(relative_path_parts[:-1])
+            else:
+                module_path = ".".join(relative_path_parts).removesuffix(".py")
+
+            if module_path.startswith(context_packages_tuple):
+                py_files_in_context.append(Path(path_str))
+
+        py_files_in_context.sort()
+        return py_files_in_context
+
+    def _needs_semantic_analysis(self) -> bool:
+        """
+        判斷是否需要執行靜態語義連結分析。
+        語義連結只會出現在組件互動圖中；未要求該分析，或已在設定中停用語義分析時，結果不會影響任何輸出。
+        """
+        if "component_interaction" not in self.config.get("analysis_types", []):
+            return False
+        comp_vis_config = self.config.get("visualization", {}).get("component_interaction_graph", {})
+        return bool(comp_vis_config.get("semantic_analysis", {}).get("enabled", True))
+
+    @staticmethod
+    def wizard_suppressed_by_config(config: dict[str, Any]) -> bool:
+        """
+        判斷設定是否已排除互動式精靈：已指定聚焦入口點、排除規則或強制執行時，不論圖的規模都不會啟動精靈。
+        也供主程式在載入完整設定前，以原始設定判斷專案能否在子程序中執行。
+        """
+        comp_vis_config = (config.get("visualization") or {}).get("component_interaction_graph") or {}
+        has_focus = (comp_vis_config.get("focus") or {}).get("entrypoints")
+        has_filter = (comp_vis_config.get("filtering") or {}).get("exclude_nodes")
+        is_forced = config.get("force_analysis", False)
+        return bool(has_focus or has_filter or is_forced)
+
     def _needs_wizard(self, node_count: int) -> bool:
         """判斷是否需要啟動互動式精靈。"""
-        vis_config = self.config.get("visualization", {})
-        comp_vis_config = vis_config.get("component_interaction_graph", {})
-        has_focus = comp_vis_config.get("focus", {}).get("entrypoints")
-        has_filter = comp_vis_config.get("filtering", {}).get("exclude_nodes")
-        is_forced = self.config.get("force_analysis", False)
-
         return (
             node_count > ASSESSMENT_THRESHOLDS["max_nodes_before_wizard"]
-            and not has_focus
-            and not has_filter
-            and not is_forced
+            and not self.wizard_suppressed_by_config(self.config)
             and sys.stdout.isatty()
         )
 
@@ -335,12 +414,14 @@ class ProjectProcessor:
         parser_results: dict[str, Any],
         semantic_results: dict[str, Any],
         docstring_map: dict[str, str],
-        report_analysis_results: dict[str, Any],
         output_dir: Path,
         context_packages: list[str],
-    ):
-        """執行單一類型的分析。"""
+    ) -> dict[str, Any]:
+        """
+        執行單一類型的分析，並回傳要併入報告的分析結果片段。
+        """
         logging.info(f"--- 開始執行分析: '{analysis_type}' ---")
+        report_analysis_results: dict[str, Any] = {}
         vis_config = self.config.get("visualization", {})
         architecture_layers = self.config.get("architecture_layers", {})
 
@@ -391,7 +472,7 @@ class ProjectProcessor:
             )
             if not track_groups:
                 logging.warning(f"在 '{analysis_type}' 分析中未找到任何要追蹤的概念種子，已跳過。")
-                return
+                return report_analysis_results
 
             analysis_results = concept_flow_analyzer.analyze_concept_flow(
                 context_packages=context_packages,
@@ -417,7 +498,7 @@ class ProjectProcessor:
             rules = dynamic_behavior_config.get("rules", [])
             if not rules:
                 logging.warning("在 'dynamic_behavior' 分析中未找到任何規則，已跳過。")
-                return
+                return report_analysis_results
 
             db_graph_config = vis_config["dynamic_behavior_graph"]
             analysis_results = dynamic_behavior_analyzer.analyze_dynamic_behavior(
@@ -442,3 +523,22 @@ class ProjectProcessor:
                 roles_config=dynamic_behavior_config.get("roles", {}),
                 docstring_map=docstring_map,
             )
+
+        return report_analysis_results
+
+
+def run_project(config_path: Path):
+    """
+    處理單一專案的完整流程。
+    作為模組層級函式，可在 spawn 模式的子程序中被序列化並執行。
+    """
+    ProjectProcessor(config_path).run()
+
+
+def init_project_worker(worker_budget: int):
+    """
+    平行處理多個專案時，每個專案子程序的初始化函式。
+    設定日誌，並限制該專案內部平行任務的工作程序數，讓所有專案合計不超過可用的 CPU 數量。
+    """
+    configure_logging()
+    set_worker_budget(worker_budget)
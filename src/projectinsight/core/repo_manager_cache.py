@@ -0,0 +1,56 @@
+# src/projectinsight/core/repo_manager_cache.py
+"""
+LibCST FullRepoManager 的共用快取。
+
+概念流動、種子發現與動態行為分析都以相同的根目錄、檔案列表與 Provider 建立 FullRepoManager；
+同一程序中處理多個指向同一專案的設定檔時亦然。此模組讓它們共用同一個已解析快取的實例。
+"""
+
+# 1. 標準庫導入
+import threading
+from collections.abc import Collection
+from typing import Any
+
+# 2. 第三方庫導入
+from libcst.metadata import (
+    FullRepoManager,
+    FullyQualifiedNameProvider,
+    ParentNodeProvider,
+    PositionProvider,
+    ScopeProvider,
+)
+
+# 3. 本專案導入
+# (無)
+
+# 概念流動、種子發現與動態行為分析共用的 Provider 集合；固定為同一個物件，快取鍵不必每次重新建立集合。
+DEFAULT_PROVIDERS: frozenset[Any] = frozenset(
+    {FullyQualifiedNameProvider, ScopeProvider, ParentNodeProvider, PositionProvider}
+)
+
+_repo_manager_cache: dict[tuple[str, tuple[str, ...], frozenset[Any]], FullRepoManager] = {}
+# 各分析類型會在不同執行緒中同時請求同一個實例，以鎖確保每個鍵只建立一次。
+_repo_manager_lock = threading.Lock()
+
+
+def get_full_repo_manager(repo_root: str, file_paths: list[str], providers: Collection[Any]) -> FullRepoManager:
+    """
+    回傳對應 (根目錄, 檔案列表, Provider 集合) 且已呼叫 resolve_cache() 的 FullRepoManager。
+    初始化失敗時拋出的例外與直接建立 FullRepoManager 時相同，不會被快取。
+
+    Args:
+        repo_root: 已解析的專案根目錄字串。
+        file_paths: 要分析的檔案絕對路徑列表。
+        providers: 要使用的 Metadata Provider 類別集合。
+
+    Returns:
+        可供多個分析共用的 FullRepoManager 實例。
+    """
+    key = (repo_root, tuple(file_paths), frozenset(providers))
+    with _repo_manager_lock:
+        repo_manager = _repo_manager_cache.get(key)
+        if repo_manager is None:
+            repo_manager = FullRepoManager(repo_root, file_paths, providers)
+            repo_manager.resolve_cache()
+            _repo_manager_cache[key] = repo_manager
+    return repo_manager
@@ -6,10 +6,10 @@
 
 # 1. 標準庫導入
 import ast
-import fnmatch
 import hashlib
 import logging
 import pickle
+import sys
 import traceback
 from pathlib import Path
 from typing import Any
@@ -27,8 +27,12 @@ from libcst.metadata import (
 )
 
 # 3. 本專案導入
-from projectinsight.core.parallel_manager import ParallelManager
-from projectinsight.utils.parser_utils import is_noise
+from projectinsight.core.parallel_manager import ParallelManager, default_max_workers
+from projectinsight.utils.parser_utils import context_package_prefixes, is_noise
+from projectinsight.utils.pattern_utils import compile_fnmatch_patterns
+
+# 快速掃描的檔案數達到此門檻時才改用多程序平行處理。
+QUICK_SCAN_PARALLEL_THRESHOLD = 200
 
 
 class CodeVisitor(ast.NodeVisitor):
@@ -38,6 +42,7 @@ class CodeVisitor(ast.NodeVisitor):
         self.module_path = module_path
         self.file_path = file_path
         self.context_packages = context_packages
+        self.context_package_tuple = tuple(context_packages)
         self.current_scope = [self.module_path]
         self.definitions: dict[str, str] = {}
         self.components: set[str] = set()
@@ -46,10 +51,16 @@ class CodeVisitor(ast.NodeVisitor):
         self.definition_count = 0
         self.has_main_block = False
         self.internal_imports: set[str] = set()
+        self.module_docstring: str | None = None
 
     def _is_internal_module(self, module_name: str) -> bool:
         """檢查一個模組名稱是否屬於專案的內部上下文。"""
-        return any(module_name.startswith(pkg) for pkg in self.context_packages)
+        return module_name.startswith(self.context_package_tuple)
+
+    def visit_Module(self, node: ast.Module):
+        """記錄模組級 docstring，讓後續分析不需為此重新解析檔案。"""
+        self.module_docstring = ast.get_docstring(node)
+        self.generic_visit(node)
 
     def visit_Import(self, node: ast.Import):
         """處理 'import a.b.c' 這種形式的導入。"""
@@ -130,9 +141,49 @@ class CodeVisitor(ast.NodeVisitor):
         self.generic_visit(node)
 
 
+def _scan_file(file_path: Path, project_path: Path, context_packages: list[str]) -> tuple[CodeVisitor | None, str, int]:
+    """
+    對單一檔案執行快速 AST 掃描，回傳 (訪問者, 原始碼, 行數)。
+    無法解析時訪問者為 None，第二個元素改為要記錄的警告訊息；已讀入的行數仍會計入總行數。
+    """
+    loc = 0
+    try:
+        content = file_path.read_text(encoding="utf-8")
+        loc = len(content.splitlines())
+        tree = ast.parse(content, filename=str(file_path))
+
+        relative_path = file_path.relative_to(project_path)
+        parts = list(relative_path.parts)
+
+        if parts[-1] == "__init__.py" or parts[-1] == "__main__.py":
+            parts.pop()
+        else:
+            parts[-1] = relative_path.stem
+        module_name = ".".join(parts)
+
+        visitor = CodeVisitor(module_name, file_path, context_packages)
+        visitor.visit(tree)
+        return visitor, content, loc
+
+    except SyntaxError as e:
+        return None, f"無法解析檔案 (語法錯誤) '{file_path}': {e}", loc
+    except Exception as e:
+        return None, f"快速掃描時無法分析檔案 '{file_path}': {e}", loc
+
+
+def _worker_quick_scan(args: tuple[Path, dict[str, Any]]) -> tuple[CodeVisitor | None, str, int]:
+    """
+    [Worker] 執行單一檔案的快速 AST 掃描。
+    """
+    file_path, context = args
+    return _scan_file(file_path, context["project_path"], context["context_packages"])
+
+
 def quick_ast_scan(project_path: Path, py_files: list[Path], context_packages: list[str]) -> dict[str, Any]:
     """
     執行一個快速的、無 Jedi 的 AST 掃描，以評估專案體量。
+    檔案數達到 QUICK_SCAN_PARALLEL_THRESHOLD 且可使用多個工作程序時以多程序平行掃描；
+    否則啟動工作程序的成本高於收益，維持單程序。
     """
     total_definitions = 0
     total_loc = 0
@@ -141,37 +192,38 @@ def quick_ast_scan(project_path: Path, py_files: list[Path], context_packages: l
     definition_to_module_map: dict[str, str] = {}
     all_definitions: dict[str, str] = {}
 
-    for file_path in py_files:
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            total_loc += len(content.splitlines())
-            tree = ast.parse(content, filename=str(file_path))
-
-            relative_path = file_path.relative_to(project_path)
-            parts = list(relative_path.parts)
-
-            if parts[-1] == "__init__.py" or parts[-1] == "__main__.py":
-                parts.pop()
-            else:
-                parts[-1] = relative_path.stem
-            module_name = ".".join(parts)
-
-            visitor = CodeVisitor(module_name, file_path, context_packages)
-            visitor.visit(tree)
-            total_definitions += visitor.definition_count
-            pre_scan_results[str(file_path)] = {
-                "visitor": visitor,
-                "content": content,
-            }
-            if visitor.internal_imports:
-                module_import_graph[visitor.module_path] = visitor.internal_imports
-            definition_to_module_map.update(visitor.definition_to_module_map)
-            all_definitions.update(visitor.definitions)
-
-        except SyntaxError as e:
-            logging.warning(f"無法解析檔案 (語法錯誤) '{file_path}': {e}")
-        except Exception as e:
-            logging.warning(f"快速掃描時無法分析檔案 '{file_path}': {e}")
+    if len(py_files) >= QUICK_SCAN_PARALLEL_THRESHOLD and default_max_workers() > 1:
+        scan_outputs = ParallelManager().execute_map_reduce(
+            task_func=_worker_quick_scan,
+            items=py_files,
+            global_context={"project_path": project_path, "context_packages": context_packages},
+            chunksize=16,
+        )
+    else:
+        scan_outputs = [_scan_file(file_path, project_path, context_packages) for file_path in py_files]
+
+    if len(scan_outputs) < len(py_files):
+        # 工作程序池中途失敗時只會回傳已完成的前段結果；其餘檔案改在主程序中掃描，避免靜默遺漏。
+        logging.warning(f"平行快速掃描只完成 {len(scan_outputs)}/{len(py_files)} 個檔案，其餘檔案改以單程序掃描。")
+        scan_outputs.extend(
+            _scan_file(file_path, project_path, context_packages) for file_path in py_files[len(scan_outputs) :]
+        )
+
+    for file_path, (visitor, content, loc) in zip(py_files, scan_outputs, strict=True):
+        total_loc += loc
+        if visitor is None:
+            logging.warning(content)
+            continue
+
+        total_definitions += visitor.definition_count
+        pre_scan_results[str(file_path)] = {
+            "visitor": visitor,
+            "content": content,
+        }
+        if visitor.internal_imports:
+            module_import_graph[visitor.module_path] = visitor.internal_imports
+        definition_to_module_map.update(visitor.definition_to_module_map)
+        all_definitions.update(visitor.definitions)
 
     logging.info(f"快速 AST 掃描完成：找到 {len(py_files)} 個檔案, {total_loc} 行程式碼, {total_definitions} 個定義。")
     return {
@@ -193,14 +245,15 @@ def _normalize_call_fqn(callee_fqn: str, alias_map: dict[str, str]) -> str:
         normalized = alias_map[callee_fqn]
         return normalized
 
-    parts = callee_fqn.split(".")
-    for i in range(len(parts), 0, -1):
-        potential_alias = ".".join(parts[:i])
+    i = callee_fqn.rfind(".")
+    while i >= 0:
+        potential_alias = callee_fqn[:i]
         if potential_alias in alias_map:
             real_base = alias_map[potential_alias]
-            method_part = ".".join(parts[i:])
+            method_part = callee_fqn[i + 1 :]
             normalized = f"{real_base}.{method_part}" if method_part else real_base
             return normalized
+        i = callee_fqn.rfind(".", 0, i)
     return callee_fqn
 
 
@@ -213,15 +266,17 @@ class _AliasVisitor(m.MatcherDecoratableVisitor):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.exclude_patterns = exclude_patterns
+        self.exclude_matcher = compile_fnmatch_patterns(exclude_patterns)
         self.alias_map: dict[str, str] = {}
 
     def _is_internal_fqn(self, fqn: str) -> bool:
         """檢查 FQN 是否屬於專案的內部上下文。"""
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _add_alias(self, alias_fqn: str, real_fqn: str):
-        is_excluded = any(fnmatch.fnmatch(alias_fqn, pattern) for pattern in self.exclude_patterns)
+        is_excluded = self.exclude_matcher is not None and self.exclude_matcher.match(alias_fqn)
 
         if not is_excluded and alias_fqn != real_fqn:
             self.alias_map[alias_fqn] = real_fqn
@@ -296,32 +351,49 @@ class _CallGraphVisitor(m.MatcherDecoratableVisitor):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
         self.module_path = module_path
         self.alias_map = alias_map
         self.file_path = file_path
         self.found_edges: set[tuple[str, str]] = set()
+        self._component_cache: dict[str, str | None] = {}
 
     def _is_internal_fqn(self, fqn: str) -> bool:
         """檢查 FQN 是否屬於專案的內部上下文。"""
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _resolve_to_public_component(self, fqn: str) -> str | None:
         """
         將 FQN 解析回其所屬的高階組件。
+        同一檔案中的呼叫者與被呼叫者 FQN 高度重複，因此結果依 FQN 快取，並將組件名稱駐留 (intern)。
         """
         if not fqn:
             return None
 
+        try:
+            return self._component_cache[fqn]
+        except KeyError:
+            pass
+
+        component = self._find_public_component(fqn)
+        if component is not None:
+            component = sys.intern(component)
+        self._component_cache[fqn] = component
+        return component
+
+    def _find_public_component(self, fqn: str) -> str | None:
+        """由長至短逐層剝除 FQN 的最後一段，找出第一個已知的高階組件。"""
         path = fqn.split(".<locals>.", 1)[0]
         if path in self.all_components:
             return path
 
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
+        i = path.rfind(".")
+        while i >= 0:
+            potential_component = path[:i]
             if potential_component in self.all_components:
                 return potential_component
+            i = path.rfind(".", 0, i)
 
         if self._is_internal_fqn(fqn):
             return None
@@ -460,13 +532,8 @@ def full_libcst_analysis(
         visitor: CodeVisitor = scan_data["visitor"]
         all_components.update(visitor.components)
         full_docstring_map.update(visitor.docstring_map)
-        try:
-            tree = ast.parse(scan_data["content"], filename=str(visitor.file_path))
-            module_docstring = ast.get_docstring(tree)
-            if module_docstring:
-                full_docstring_map[visitor.module_path] = module_docstring
-        except Exception as e:
-            logging.debug(f"無法為 {visitor.file_path} 解析模組級 docstring: {e}")
+        if visitor.module_docstring:
+            full_docstring_map[visitor.module_path] = visitor.module_docstring
 
     if not project_root:
         logging.error("full_libcst_analysis 缺少 project_root，無法初始化 Worker。")
@@ -476,6 +543,8 @@ def full_libcst_analysis(
     alias_map: dict[str, str] = {}
     file_alias_cache_buffer: dict[str, dict[str, str]] = {}
 
+    # 任一平行階段回傳的結果數少於輸入數 (工作程序池中途失敗) 時，標記結果不完整。
+    complete = True
     files_to_process_p1: list[str] = []
     files_using_cache_p1: list[str] = []
 
@@ -508,6 +577,9 @@ def full_libcst_analysis(
             chunksize=5,
         )
 
+        if len(results_p1) != len(files_to_process_p1):
+            complete = False
+
         for file_path_str, file_alias_map in zip(files_to_process_p1, results_p1, strict=False):
             alias_map.update(file_alias_map)
             file_alias_cache_buffer[file_path_str] = file_alias_map
@@ -555,6 +627,9 @@ def full_libcst_analysis(
             chunksize=2,
         )
 
+        if len(results_p2) != len(files_to_process_p2):
+            complete = False
+
         for (file_path_str, _), edges in zip(files_to_process_p2, results_p2, strict=False):
             call_graph.update(edges)
 
@@ -573,4 +648,5 @@ def full_libcst_analysis(
         "components": all_components,
         "definition_to_module_map": initial_definition_map,
         "docstring_map": full_docstring_map,
+        "complete": complete,
     }
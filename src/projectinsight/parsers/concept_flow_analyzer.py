@@ -4,6 +4,7 @@
 """
 
 # 1. 標準庫導入
+import functools
 import logging
 from pathlib import Path
 from typing import Any
@@ -11,20 +12,22 @@ from typing import Any
 # 2. 第三方庫導入
 import libcst as cst
 from libcst.metadata import (
-    FullRepoManager,
     FullyQualifiedNameProvider,
     MetadataWrapper,
-    ParentNodeProvider,
-    PositionProvider,
     ScopeProvider,
 )
 
 # 3. 本專案導入
-# (無)
+from projectinsight.core.repo_manager_cache import DEFAULT_PROVIDERS, get_full_repo_manager
+from projectinsight.utils.path_utils import resolve_paths_under_root
 
 
+@functools.cache
 def _normalize_fqn(name: str, display_pkg: str) -> str:
-    """正規化 FQN，使其與使用者定義的格式一致。"""
+    """
+    正規化 FQN，使其與使用者定義的格式一致。
+    同一個 FQN 會在追蹤迭代中被反覆正規化，因此結果以 functools.cache 快取。
+    """
     if display_pkg in name:
         name = name[name.find(display_pkg) :]
     return name.replace(".<locals>", "")
@@ -108,13 +111,10 @@ def analyze_concept_flow(
 
     logging.info(f"準備分析專案: {project_root}")
 
-    repo_root = str(project_root.resolve())
-    file_paths_str = [str(p.resolve()) for p in py_files]
-    providers = {FullyQualifiedNameProvider, ScopeProvider, ParentNodeProvider, PositionProvider}
+    repo_root, file_paths_str = resolve_paths_under_root(project_root, py_files)
 
     try:
-        repo_manager = FullRepoManager(repo_root, file_paths_str, providers)
-        repo_manager.resolve_cache()
+        repo_manager = get_full_repo_manager(repo_root, file_paths_str, DEFAULT_PROVIDERS)
         logging.info("LibCST 儲存庫管理器初始化並解析快取完成。")
     except Exception as e:
         logging.error(f"初始化 LibCST FullRepoManager 時發生嚴重錯誤: {e}")
@@ -4,7 +4,6 @@
 """
 
 # 1. 標準庫導入
-import fnmatch
 import logging
 from pathlib import Path
 from typing import Any
@@ -12,16 +11,18 @@ from typing import Any
 # 2. 第三方庫導入
 import libcst as cst
 from libcst.metadata import (
-    FullRepoManager,
     FullyQualifiedNameProvider,
     GlobalScope,
     MetadataWrapper,
-    ParentNodeProvider,
-    PositionProvider,
     ScopeProvider,
 )
 
 # 3. 本專案導入
+from projectinsight.core.repo_manager_cache import DEFAULT_PROVIDERS, get_full_repo_manager
+from projectinsight.utils.parser_utils import context_package_prefixes
+from projectinsight.utils.path_utils import resolve_paths_under_root
+from projectinsight.utils.pattern_utils import compile_fnmatch_patterns
+
 from .concept_flow_analyzer import _normalize_fqn
 
 
@@ -36,11 +37,12 @@ class SeedDiscoveryVisitor(cst.CSTVisitor):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.discovered_seeds: set[str] = set()
 
     def _is_internal_fqn(self, fqn: str) -> bool:
         """檢查 FQN 是否屬於專案的內部上下文。"""
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def visit_Assign(self, node: cst.Assign) -> None:
         scope = self.wrapper.resolve(ScopeProvider).get(node)
@@ -73,13 +75,10 @@ def discover_seeds(
 
     logging.info(f"準備自動發現種子: {project_root}")
 
-    repo_root = str(project_root.resolve())
-    file_paths_str = [str(p.resolve()) for p in py_files]
-    providers = {FullyQualifiedNameProvider, ScopeProvider, ParentNodeProvider, PositionProvider}
+    repo_root, file_paths_str = resolve_paths_under_root(project_root, py_files)
 
     try:
-        repo_manager = FullRepoManager(repo_root, file_paths_str, providers)
-        repo_manager.resolve_cache()
+        repo_manager = get_full_repo_manager(repo_root, file_paths_str, DEFAULT_PROVIDERS)
     except Exception as e:
         logging.error(f"初始化 LibCST FullRepoManager 時發生嚴重錯誤: {e}")
         return []
@@ -95,15 +94,10 @@ def discover_seeds(
 
     logging.info(f"自動發現了 {len(discovered_fqns)} 個潛在的概念種子。")
 
-    filtered_fqns = set()
-    for fqn in discovered_fqns:
-        is_excluded = False
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(fqn, pattern):
-                is_excluded = True
-                break
-        if not is_excluded:
-            filtered_fqns.add(fqn)
+    exclude_matcher = compile_fnmatch_patterns(exclude_patterns)
+    filtered_fqns = (
+        {fqn for fqn in discovered_fqns if not exclude_matcher.match(fqn)} if exclude_matcher else discovered_fqns
+    )
 
     logging.info(f"應用排除規則後，剩餘 {len(filtered_fqns)} 個概念種子。")
 
@@ -5,16 +5,18 @@
 
 # 1. 標準庫導入
 import datetime
-import fnmatch
 import logging
+import os
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 # 2. 第三方庫導入
 # (無)
 # 3. 本專案導入
-from projectinsight.utils.file_system_utils import generate_tree_structure
+from projectinsight.utils.file_system_utils import generate_tree_structure, iter_files
+
+SOURCE_COPY_BUFFER_SIZE = 64 * 1024
 
 
 def _collect_source_files(target_project_root: Path, report_settings: dict[str, Any]) -> list[Path]:
@@ -23,26 +25,52 @@ def _collect_source_files(target_project_root: Path, report_settings: dict[str,
     included_extensions = set(source_code_settings.get("included_extensions", []))
     exclude_dirs = set(report_settings.get("tree_view", {}).get("exclude_dirs", []))
 
-    collected = []
-    all_files = sorted([p for p in target_project_root.rglob("*") if p.is_file()])
-
-    for file_path in all_files:
-        is_excluded = False
-        for part in file_path.parts:
-            for pattern in exclude_dirs:
-                if fnmatch.fnmatch(part, pattern):
-                    is_excluded = True
-                    break
-            if is_excluded:
-                break
-        if is_excluded:
-            continue
-
-        if file_path.suffix in included_extensions:
-            collected.append(file_path)
+    collected = [
+        Path(entry.path)
+        for entry in iter_files(target_project_root, exclude_dirs)
+        if os.path.splitext(entry.name)[1] in included_extensions
+    ]
+    collected.sort()
     return collected
 
 
+def _write_source_file_section(outfile: TextIO, file_path: Path, target_project_root: Path):
+    """
+    將單一原始碼檔案以可摺疊區塊的形式串流寫入報告。
+    檔案以 UTF-8 文字模式分塊讀取並逐塊寫入，不需整份讀入記憶體；換行處理與 read_text / write_text 相同。
+    若檔案無法以 UTF-8 解碼，已寫入的部分內容會被截除，改寫入錯誤訊息，確保報告維持合法的 UTF-8。
+    """
+    relative_path = file_path.relative_to(target_project_root).as_posix()
+    file_extension = file_path.suffix.lstrip(".")
+    header = f"\n<details>\n<summary><code>{relative_path}</code></summary>\n\n```{file_extension}\n"
+    outfile.write(header)
+    content_start = outfile.tell()
+    try:
+        with open(file_path, encoding="utf-8") as infile:
+            chunk = infile.read(SOURCE_COPY_BUFFER_SIZE)
+            while chunk:
+                outfile.write(chunk)
+                chunk = infile.read(SOURCE_COPY_BUFFER_SIZE)
+    except (OSError, UnicodeDecodeError) as e:
+        outfile.seek(content_start)
+        outfile.truncate()
+        outfile.write(f"無法讀取檔案: {_whole_file_read_error(file_path, e)}")
+    outfile.write("\n```\n</details>\n")
+
+
+def _whole_file_read_error(file_path: Path, error: Exception) -> Exception:
+    """
+    分塊解碼的錯誤位置是相對於當前區塊；解碼失敗時重新整份讀取一次，
+    取得與整檔讀取相同、以檔案開頭計算位置的錯誤訊息。
+    """
+    if isinstance(error, UnicodeDecodeError):
+        try:
+            file_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as e:
+            return e
+    return error
+
+
 def _write_debug_log(output_path: Path, project_name: str, filtered_components: list[str]):
     """將除錯資訊寫入一個單獨的日誌檔案。"""
     debug_log_path = output_path.with_name(f"{project_name}_InsightDebug.log")
@@ -171,21 +199,12 @@ def generate_markdown_report(
 
     report_parts.append("## 5. 專案完整原始碼")
     source_files = _collect_source_files(target_project_root, report_settings)
-    for file_path in source_files:
-        relative_path = file_path.relative_to(target_project_root).as_posix()
-        report_parts.append(f"<details>\n<summary><code>{relative_path}</code></summary>\n")
-        file_extension = file_path.suffix.lstrip(".")
-        report_parts.append(f"```{file_extension}")
-        try:
-            content = file_path.read_text(encoding="utf-8")
-            report_parts.append(content)
-        except Exception as e:
-            report_parts.append(f"無法讀取檔案: {e}")
-        report_parts.append("```\n</details>\n")
 
     try:
-        final_report = "\n".join(report_parts)
-        output_path.write_text(final_report, encoding="utf-8")
+        with open(output_path, "w", encoding="utf-8") as outfile:
+            outfile.write("\n".join(report_parts))
+            for file_path in source_files:
+                _write_source_file_section(outfile, file_path, target_project_root)
         logging.info(f"Markdown 報告已成功儲存至: {output_path}")
     except Exception as e:
         logging.error(f"寫入 Markdown 報告時發生錯誤: {e}")
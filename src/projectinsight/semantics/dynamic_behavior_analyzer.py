@@ -12,7 +12,6 @@ import libcst as cst
 import libcst.matchers as m
 from libcst.matchers import BaseMatcherNode
 from libcst.metadata import (
-    FullRepoManager,
     FullyQualifiedNameProvider,
     MetadataWrapper,
     ParentNodeProvider,
@@ -20,6 +19,9 @@ from libcst.metadata import (
     ScopeProvider,
 )
 
+from projectinsight.core.repo_manager_cache import DEFAULT_PROVIDERS, get_full_repo_manager
+from projectinsight.utils.path_utils import resolve_paths_under_root
+
 
 class DynamicBehaviorVisitor(m.MatcherDecoratableVisitor):
     """
@@ -174,12 +176,9 @@ def analyze_dynamic_behavior(
         logging.warning("未定義任何動態行為規則，已跳過。")
         return {"links": []}
 
-    repo_root = str(project_root.resolve())
-    file_paths_str = [str(p.resolve()) for p in py_files]
-    providers = {FullyQualifiedNameProvider, ScopeProvider, ParentNodeProvider, PositionProvider}
+    repo_root, file_paths_str = resolve_paths_under_root(project_root, py_files)
     try:
-        repo_manager = FullRepoManager(repo_root, file_paths_str, providers)
-        repo_manager.resolve_cache()
+        repo_manager = get_full_repo_manager(repo_root, file_paths_str, DEFAULT_PROVIDERS)
     except Exception as e:
         logging.error(f"初始化 LibCST FullRepoManager 時發生嚴重錯誤: {e}")
         return {}
@@ -22,7 +22,36 @@ from libcst.metadata import (
 
 # 3. 本專案導入
 from projectinsight.core.parallel_manager import ParallelManager
-from projectinsight.utils.parser_utils import DECORATOR_IGNORE_PREFIXES, is_noise
+from projectinsight.utils.parser_utils import DECORATOR_IGNORE_PREFIXES, context_package_prefixes, is_noise
+
+
+class _ComponentIndex:
+    """
+    將 FQN 對應至其所屬高階組件的前綴查詢。
+    同一檔案的六個語義訪問者會反覆解析相同的 FQN，因此共用一個實例並快取查詢結果。
+    """
+
+    def __init__(self, all_components: set[str]):
+        self.all_components = all_components
+        self._cache: dict[str, str | None] = {}
+
+    def find(self, path: str) -> str | None:
+        """回傳 path 本身或其最長的、屬於高階組件的前綴；找不到時回傳 None。"""
+        try:
+            return self._cache[path]
+        except KeyError:
+            pass
+
+        component = path if path in self.all_components else None
+        i = path.rfind(".")
+        while component is None and i >= 0:
+            potential_component = path[:i]
+            if potential_component in self.all_components:
+                component = potential_component
+            i = path.rfind(".", 0, i)
+
+        self._cache[path] = component
+        return component
 
 
 class _CollectionRegistrationVisitor(m.MatcherDecoratableVisitor):
@@ -32,29 +61,32 @@ class _CollectionRegistrationVisitor(m.MatcherDecoratableVisitor):
 
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider, ParentNodeProvider)
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
 
     def _is_internal_fqn(self, fqn: str) -> bool:
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
         if not fqn:
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
         return fqn
 
     def _get_fqn_from_node(self, node: cst.CSTNode) -> str | None:
@@ -116,29 +148,32 @@ class _InheritanceVisitor(m.MatcherDecoratableVisitor):
 
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider)
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
 
     def _is_internal_fqn(self, fqn: str) -> bool:
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
         if not fqn:
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
 
         if is_noise(fqn):
             return None
@@ -187,29 +222,32 @@ class _DecoratorVisitor(m.MatcherDecoratableVisitor):
 
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider, ParentNodeProvider)
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
 
     def _is_internal_fqn(self, fqn: str) -> bool:
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
         if not fqn:
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
 
         if is_noise(fqn, DECORATOR_IGNORE_PREFIXES):
             return None
@@ -272,11 +310,18 @@ class _ProxyVisitor(m.MatcherDecoratableVisitor):
 
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider)
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
@@ -284,14 +329,9 @@ class _ProxyVisitor(m.MatcherDecoratableVisitor):
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
         return fqn
 
     def _get_fqn_from_node(self, node: cst.CSTNode) -> str | None:
@@ -422,30 +462,33 @@ class _StrategyRegistrationVisitor(m.MatcherDecoratableVisitor):
 
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider, ParentNodeProvider)
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
         self.strategy_lists: dict[str, str] = {}
 
     def _is_internal_fqn(self, fqn: str) -> bool:
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages)
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
         if not fqn:
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
         return fqn
 
     def _get_fqn_from_node(self, node: cst.CSTNode) -> str | None:
@@ -546,29 +589,32 @@ class _DependencyInjectionVisitor(m.MatcherDecoratableVisitor):
     METADATA_DEPENDENCIES = (ScopeProvider, FullyQualifiedNameProvider, ParentNodeProvider)
     HTTP_METHODS: ClassVar[set[str]] = {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
 
-    def __init__(self, wrapper: MetadataWrapper, context_packages: list[str], all_components: set[str]):
+    def __init__(
+        self,
+        wrapper: MetadataWrapper,
+        context_packages: list[str],
+        all_components: set[str],
+        component_index: _ComponentIndex | None = None,
+    ):
         super().__init__()
         self.wrapper = wrapper
         self.context_packages = context_packages
+        self.context_prefixes = context_package_prefixes(context_packages)
         self.all_components = all_components
+        self.component_index = component_index or _ComponentIndex(all_components)
         self.semantic_edges: set[tuple[str, str, str]] = set()
 
     def _is_internal_fqn(self, fqn: str) -> bool:
-        return any(fqn.startswith(f"{pkg}.") or fqn == pkg for pkg in self.context_packages) or "docs_src" in fqn
+        return fqn.startswith(self.context_prefixes) or fqn in self.context_packages or "docs_src" in fqn
 
     def _resolve_to_component(self, fqn: str | None) -> str | None:
         if not fqn:
             return None
         if ".<locals>." in fqn:
             return None
-        path = fqn.split(".<locals>.", 1)[0]
-        if path in self.all_components:
-            return path
-        parts = path.split(".")
-        for i in range(len(parts) - 1, 0, -1):
-            potential_component = ".".join(parts[:i])
-            if potential_component in self.all_components:
-                return potential_component
+        component = self.component_index.find(fqn)
+        if component is not None:
+            return component
         if "docs_src" in fqn:
             return fqn
         return fqn
@@ -650,13 +696,14 @@ def _worker_analyze_semantic_links(args: tuple[str, dict[str, Any]]) -> set[tupl
         )
         wrapper = repo_manager.get_metadata_wrapper_for_path(file_path_str)
 
+        component_index = _ComponentIndex(all_components)
         visitors = [
-            _CollectionRegistrationVisitor(wrapper, context_packages, all_components),
-            _InheritanceVisitor(wrapper, context_packages, all_components),
-            _DecoratorVisitor(wrapper, context_packages, all_components),
-            _ProxyVisitor(wrapper, context_packages, all_components),
-            _StrategyRegistrationVisitor(wrapper, context_packages, all_components),
-            _DependencyInjectionVisitor(wrapper, context_packages, all_components),
+            _CollectionRegistrationVisitor(wrapper, context_packages, all_components, component_index),
+            _InheritanceVisitor(wrapper, context_packages, all_components, component_index),
+            _DecoratorVisitor(wrapper, context_packages, all_components, component_index),
+            _ProxyVisitor(wrapper, context_packages, all_components, component_index),
+            _StrategyRegistrationVisitor(wrapper, context_packages, all_components, component_index),
+            _DependencyInjectionVisitor(wrapper, context_packages, all_components, component_index),
         ]
 
         file_semantic_edges = set()
@@ -687,6 +734,7 @@ def analyze_semantic_links(
 
     files_to_process: list[str] = []
     files_using_cache: list[str] = []
+    complete = True
 
     for file_path_str in pre_scan_results:
         file_path_obj = Path(file_path_str)
@@ -716,6 +764,9 @@ def analyze_semantic_links(
             chunksize=5,
         )
 
+        # 工作程序池中途失敗時只會回傳部分結果，標記為不完整，避免被當成完整結果沿用。
+        complete = len(results) == len(files_to_process)
+
         for file_path_str, edges in zip(files_to_process, results, strict=False):
             all_semantic_edges.update(edges)
 
@@ -727,4 +778,4 @@ def analyze_semantic_links(
 
     logging.info(f"--- 語義連結分析完成，發現 {len(all_semantic_edges)} 條連結 ---")
 
-    return {"semantic_edges": all_semantic_edges}
+    return {"semantic_edges": all_semantic_edges, "complete": complete}
@@ -3,16 +3,21 @@
 通用工具函式套件。
 """
 
-from .file_system_utils import generate_tree_structure
-from .logging_utils import PickleFilter
+from .file_system_utils import generate_tree_structure, iter_files
+from .logging_utils import PickleFilter, configure_logging
 from .parser_utils import DECORATOR_IGNORE_PREFIXES, GLOBAL_IGNORE_PREFIXES, is_noise
-from .path_utils import find_project_root
+from .path_utils import find_project_root, resolve_paths_under_root
+from .pattern_utils import compile_fnmatch_patterns
 
 __all__ = [
     "DECORATOR_IGNORE_PREFIXES",
     "GLOBAL_IGNORE_PREFIXES",
     "PickleFilter",
+    "compile_fnmatch_patterns",
+    "configure_logging",
     "find_project_root",
     "generate_tree_structure",
     "is_noise",
+    "iter_files",
+    "resolve_paths_under_root",
 ]
@@ -4,15 +4,15 @@
 """
 
 # 1. 標準庫導入
-import fnmatch
+import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
 # 2. 第三方庫導入
 # (無)
-
 # 3. 本專案導入
-# (無)
+from projectinsight.utils.pattern_utils import compile_fnmatch_patterns
 
 DEFAULT_EXCLUDED_DIRS: set[str] = {
     "__pycache__",
@@ -29,6 +29,36 @@ DEFAULT_EXCLUDED_DIRS: set[str] = {
 }
 
 
+def iter_files(start_path: Path, exclude_dirs: Iterable[str] = ()) -> Iterator[os.DirEntry[str]]:
+    """
+    以 os.scandir 走訪目錄樹，逐一產出其中的檔案項目。
+
+    符合 exclude_dirs 中任一 fnmatch 模式的目錄會在目錄層級直接剪枝，整個子樹都不會被走訪；
+    項目類型取自 scandir 快取的 dirent 資訊，不需為每個項目額外呼叫 stat。
+
+    Args:
+        start_path: 走訪的起始目錄。
+        exclude_dirs: 要剪枝的目錄名稱模式 (支援 fnmatch 萬用字元)。
+
+    Returns:
+        一個產出 os.DirEntry 檔案項目的迭代器 (順序不保證)。
+    """
+    exclude_matcher = compile_fnmatch_patterns(exclude_dirs)
+    stack = [os.fspath(start_path)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if exclude_matcher is None or not exclude_matcher.match(entry.name):
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry
+        except OSError:
+            continue
+
+
 def generate_tree_structure(
     start_path: Path,
     tree_settings: dict[str, Any],
@@ -48,39 +78,45 @@ def generate_tree_structure(
     Returns:
         一個包含目錄樹結構字串的列表。
     """
-    exclude_dirs = set(tree_settings.get("exclude_dirs", DEFAULT_EXCLUDED_DIRS))
+    exclude_dirs_matcher = compile_fnmatch_patterns(tree_settings.get("exclude_dirs", DEFAULT_EXCLUDED_DIRS))
     exclude_extensions = set(tree_settings.get("exclude_extensions", []))
-    exclude_files = set(tree_settings.get("exclude_files", []))
+    exclude_files_matcher = compile_fnmatch_patterns(tree_settings.get("exclude_files", []))
 
     tree_lines = [f"{start_path.name}/"]
 
-    def recurse(directory: Path, prefix: str = ""):
-        """遞迴地建構目錄樹的內部輔助函式."""
-
-        def is_excluded(p: Path) -> bool:
-            """檢查路徑是否符合任何排除模式。"""
-            if p.is_dir():
-                return any(fnmatch.fnmatch(p.name, pattern) for pattern in exclude_dirs)
-
-            if p.suffix in exclude_extensions:
-                return True
-
-            return any(fnmatch.fnmatch(p.name, pattern) for pattern in exclude_files)
+    def suffix_of(name: str) -> str:
+        """與 PurePath.suffix 相同的副檔名判定，但不需建立 Path 物件。"""
+        i = name.rfind(".")
+        return name[i:] if 0 < i < len(name) - 1 else ""
 
+    def recurse(directory: str, prefix: str = ""):
+        """遞迴地建構目錄樹的內部輔助函式。項目類型取自 scandir 快取的資訊，每個項目只判定一次。"""
+        items: list[tuple[bool, bool, str, str]] = []
         try:
-            items = sorted(
-                [p for p in directory.iterdir() if not is_excluded(p)],
-                key=lambda p: (p.is_file(), p.name.lower()),
-            )
+            with os.scandir(directory) as it:
+                for entry in it:
+                    name = entry.name
+                    is_dir = entry.is_dir()
+                    if is_dir:
+                        if exclude_dirs_matcher and exclude_dirs_matcher.match(name):
+                            continue
+                    elif suffix_of(name) in exclude_extensions or (
+                        exclude_files_matcher and exclude_files_matcher.match(name)
+                    ):
+                        continue
+                    is_file = not is_dir and entry.is_file()
+                    items.append((is_file, is_dir, name, entry.path))
         except OSError:
             return
 
+        items.sort(key=lambda item: (item[0], item[2].lower()))
+
         pointers = ["├── "] * (len(items) - 1) + ["└── "]
-        for pointer, path in zip(pointers, items, strict=False):
-            tree_lines.append(f"{prefix}{pointer}{path.name}")
-            if path.is_dir():
+        for pointer, (_, is_dir, name, path) in zip(pointers, items, strict=False):
+            tree_lines.append(f"{prefix}{pointer}{name}")
+            if is_dir:
                 extension = "│   " if pointer == "├── " else "    "
                 recurse(path, prefix + extension)
 
-    recurse(start_path)
+    recurse(os.fspath(start_path))
     return tree_lines
@@ -23,3 +23,20 @@ class PickleFilter(logging.Filter):
         如果日誌訊息不包含 'pickle loaded'，則回傳 True。
         """
         return "pickle loaded" not in record.getMessage()
+
+
+def configure_logging():
+    """
+    設定根日誌記錄器：輸出至主控台，並套用 PickleFilter。
+    主程序與平行處理專案的子程序共用同一份設定。
+    """
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+
+    if not root_logger.handlers:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.DEBUG)
+        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+        console_handler.setFormatter(formatter)
+        console_handler.addFilter(PickleFilter())
+        root_logger.addHandler(console_handler)
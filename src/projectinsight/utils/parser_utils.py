@@ -93,3 +93,11 @@ def is_noise(fqn: str, extra_prefixes: tuple[str, ...] = ()) -> bool:
         return True
 
     return bool(extra_prefixes and fqn.startswith(extra_prefixes))
+
+
+def context_package_prefixes(context_packages: list[str]) -> tuple[str, ...]:
+    """
+    將上下文套件名稱轉為可直接傳給 str.startswith 的前綴元組 (每個名稱加上結尾的 '.')。
+    供訪問者在初始化時預先計算，避免每次判斷內部 FQN 時重新格式化字串。
+    """
+    return tuple(f"{pkg}." for pkg in context_packages)
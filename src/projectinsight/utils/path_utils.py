@@ -5,8 +5,10 @@
 """
 
 # 1. 標準庫導入
+import functools
 import importlib.resources
 import logging
+import os
 from pathlib import Path
 
 # 2. 第三方庫導入
@@ -45,6 +47,8 @@ def find_top_level_packages(source_root: Path) -> list[str]:
     """
     掃描給定的原始碼根目錄，自動偵測所有頂層的 Python 套件或包含 Python 程式碼的目錄。
     修正：現在會包含根目錄下的獨立 .py 檔案 (模組)。
+    設定載入與專案處理都會對同一個根目錄呼叫此函式，因此結果依解析後的路徑快取；
+    磁碟內容變更後可呼叫 `_scan_top_level_packages.cache_clear()` 使其失效。
 
     Args:
         source_root: 要掃描的 Python 原始碼根目錄。
@@ -52,9 +56,16 @@ def find_top_level_packages(source_root: Path) -> list[str]:
     Returns:
         一個包含所有頂層上下文根名稱的字串列表。
     """
+    return list(_scan_top_level_packages(str(source_root.resolve())))
+
+
+@functools.lru_cache(maxsize=32)
+def _scan_top_level_packages(source_root_str: str) -> tuple[str, ...]:
+    """實際掃描頂層套件；回傳不可變的元組，讓快取的結果不會被呼叫端修改。"""
+    source_root = Path(source_root_str)
     if not source_root.is_dir():
         logging.warning(f"提供的原始碼路徑不是一個有效目錄: {source_root}")
-        return []
+        return ()
 
     top_level_items = []
     try:
@@ -70,6 +81,33 @@ def find_top_level_packages(source_root: Path) -> list[str]:
 
     except OSError as e:
         logging.error(f"掃描頂層套件時發生檔案系統錯誤: {e}")
-        return []
+        return ()
+
+    return tuple(sorted(top_level_items))
+
+
+def resolve_paths_under_root(root: Path, paths: list[Path]) -> tuple[str, list[str]]:
+    """
+    只解析根目錄一次，並以字串替換前綴的方式取得其下各檔案的絕對路徑。
+    Path.resolve() 會為路徑中的每一層查詢檔案系統；收集自根目錄的檔案不需逐一解析，
+    不在根目錄下的路徑才退回逐一解析。
+
+    Args:
+        root: 檔案所在的根目錄。
+        paths: 要轉換的檔案路徑列表。
 
-    return sorted(top_level_items)
+    Returns:
+        (解析後的根目錄字串, 對應各檔案的絕對路徑字串列表)。
+    """
+    root_abs = str(root.resolve())
+    prefix = os.path.join(os.fspath(root), "")
+    prefix_len = len(prefix)
+
+    resolved_paths = []
+    for path in paths:
+        path_str = os.fspath(path)
+        if path_str.startswith(prefix):
+            resolved_paths.append(os.path.join(root_abs, path_str[prefix_len:]))
+        else:
+            resolved_paths.append(str(path.resolve()))
+    return root_abs, resolved_paths
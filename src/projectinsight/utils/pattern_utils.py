@@ -0,0 +1,72 @@
+# src/projectinsight/utils/pattern_utils.py
+"""
+提供與萬用字元模式比對相關的公用函式。
+"""
+
+# 1. 標準庫導入
+import fnmatch
+import os
+import re
+from collections.abc import Iterable
+
+# 2. 第三方庫導入
+# (無)
+
+# 3. 本專案導入
+# (無)
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+class FnmatchPatternSet:
+    """
+    一組預先編譯的 fnmatch 模式。
+    不含萬用字元的模式以集合查詢比對，只有結尾 '*' 的前綴模式以 str.startswith 比對，
+    其餘模式合併為單一正規表示式；每個字串只需一次比對即可得知是否符合任一模式。
+    """
+
+    def __init__(self, patterns: list[str]):
+        case_sensitive = os.path.normcase("A") == "A"
+        literals: set[str] = set()
+        prefixes: list[str] = []
+        globs: list[str] = []
+        for pattern in patterns:
+            if not case_sensitive:
+                globs.append(pattern)
+            elif not _WILDCARD_CHARS.intersection(pattern):
+                literals.add(pattern)
+            elif pattern.endswith("*") and not _WILDCARD_CHARS.intersection(pattern[:-1]):
+                prefixes.append(pattern[:-1])
+            else:
+                globs.append(pattern)
+
+        self.literals = frozenset(literals)
+        self.prefixes = tuple(prefixes)
+        # 與 fnmatch.fnmatch 相同，在大小寫不敏感的平台上忽略大小寫。
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self.regex = (
+            re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in globs), flags) if globs else None
+        )
+
+    def match(self, name: str) -> bool:
+        """檢查 name 是否符合任一模式。"""
+        if name in self.literals or name.startswith(self.prefixes):
+            return True
+        return self.regex is not None and self.regex.match(name) is not None
+
+
+def compile_fnmatch_patterns(patterns: Iterable[str]) -> FnmatchPatternSet | None:
+    """
+    將多個 fnmatch 模式預先編譯為 FnmatchPatternSet，每個字串只需比對一次即可得知是否符合任一模式。
+    與 fnmatch.fnmatch 相同，在大小寫不敏感的平台上會忽略大小寫。
+
+    Args:
+        patterns: 要合併的 fnmatch 模式 (支援 * 與 ? 等萬用字元)。
+
+    Returns:
+        編譯後的 FnmatchPatternSet，以 match() 進行比對；若沒有任何模式則回傳 None。
+    """
+    pattern_list = list(patterns)
+    if not pattern_list:
+        return None
+    return FnmatchPatternSet(pattern_list)